@@ -12,6 +12,7 @@ Combines both admin functionality and command platform features.
 
 from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Query
 from sqlmodel import Session, select, func, or_, and_
+from sqlmodel.ext.asyncio.session import AsyncSession
 from pydantic import BaseModel, Field
 from typing import Optional
 from datetime import datetime
@@ -20,9 +21,10 @@ import math
 
 from src.models.user import Driver, User
 from src.models.location import Location
-from src.db.session import get_session
+from src.db.session import get_session, get_async_db
 from src.schemas.auth import CurrentUser
 from src.services.auth import AuthService
+from src.services.users import UserService
 from src.schemas.user import DriverStatusUpdate, DriverStatusResponse
 from src.core.settings import Settings
 from src.services.geocoding import GeocodingService
@@ -1348,7 +1350,7 @@ async def get_driver_earnings(
 
 @router.get("/active-trip")
 async def get_driver_active_trip(
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_db),
     current_user: CurrentUser = Depends(AuthService.get_current_user_dependency)
 ) -> dict:
     """Get the active trip for the authenticated driver."""
@@ -1360,18 +1362,16 @@ async def get_driver_active_trip(
     
     try:
         logger.info(f"🔍 Checking active trip for auth_id: {current_user.auth_id}")
-        user = session.exec(
-            select(User).where(User.auth_id == current_user.auth_id)
-        ).first()
+        user = await UserService.get_user_by_auth_id_async(session, current_user.auth_id)
         
         if not user:
             logger.error(f"❌ User not found for auth_id: {current_user.auth_id}")
             raise HTTPException(status_code=404, detail="User not found")
 
         logger.info(f"✅ User found: {user.id}, role: {user.role}")
-        driver = session.exec(
+        driver = (await session.exec(
             select(Driver).where(Driver.user_id == user.id)
-        ).first()
+        )).first()
         
         if not driver:
             logger.error(f"❌ Driver profile not found for user_id: {user.id}")
@@ -1379,7 +1379,7 @@ async def get_driver_active_trip(
         
         logger.info(f"✅ Driver found: {driver.id}")
         
-        trip = TripService.get_driver_active_trip(session, driver.id)
+        trip = await TripService.get_driver_active_trip_async(session, driver.id)
         
         # Double-check trip is not cancelled (extra safety)
         if trip and trip.status == "cancelled":
@@ -1391,9 +1391,9 @@ async def get_driver_active_trip(
                 "message": "No active trip found for driver"
             }
         
-        rider = session.exec(
+        rider = (await session.exec(
             select(User).where(User.id == trip.rider_id)
-        ).first()
+        )).first()
         
         # Geocode addresses if they're missing or generic
         geocoding_service = GeocodingService()
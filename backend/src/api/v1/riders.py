@@ -9,6 +9,7 @@ from typing import List, Optional
 from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException, Query, Body
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from pydantic import BaseModel, Field
 from src.models.location import Location
 from src.models.user import User, Driver
@@ -17,7 +18,7 @@ from src.services.location import LocationService
 from src.services.trip import TripService
 from src.schemas.auth import CurrentUser
 from src.services.auth import AuthService
-from src.db.session import get_session
+from src.db.session import get_session, get_async_db
 from src.core.settings import Settings
 from src.services.geocoding import GeocodingService
 
@@ -60,6 +61,25 @@ def get_user_from_current_user(session: Session, current_user: CurrentUser) -> U
     return user
 
 
+async def get_user_from_current_user_async(session: AsyncSession, current_user: CurrentUser) -> User:
+    """
+    Async variant of get_user_from_current_user for endpoints using an AsyncSession.
+    """
+    from src.core.settings import settings
+    
+    # In dev mode auth_id IS the user ID, in production it is the Supabase auth ID
+    lookup_column = User.id if settings.development_mode else User.auth_id
+    result = await session.exec(
+        select(User).where(lookup_column == current_user.auth_id)
+    )
+    user = result.first()
+    
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    
+    return user
+
+
 class TripRequest(BaseModel):
     """Request model for trip planning."""
     rider_lat: float = Field(..., ge=-90, le=90, description="Rider latitude coordinate")
@@ -343,7 +363,7 @@ async def create_trip(
 
 @router.get("/active-trip")
 async def get_rider_active_trip(
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_db),
     current_user: CurrentUser = Depends(AuthService.get_current_user_dependency)
 ) -> dict:
     """
@@ -354,12 +374,12 @@ async def get_rider_active_trip(
     """
     try:
         # Find the user
-        user = get_user_from_current_user(session, current_user)
+        user = await get_user_from_current_user_async(session, current_user)
         
         if user.role != "rider":
             raise HTTPException(status_code=403, detail="Only riders can access this endpoint")
         
-        trip = TripService.get_rider_active_trip(session, user.id)
+        trip = await TripService.get_rider_active_trip_async(session, user.id)
         
         if not trip:
             return {
@@ -370,13 +390,13 @@ async def get_rider_active_trip(
         # Get driver info if assigned
         driver_info = None
         if trip.driver_id:
-            driver_user = session.exec(
+            driver_user = (await session.exec(
                 select(User).where(User.id == trip.driver_id)
-            ).first()
+            )).first()
             
-            driver_profile = session.exec(
+            driver_profile = (await session.exec(
                 select(Driver).where(Driver.user_id == trip.driver_id)
-            ).first()
+            )).first()
             
             if driver_user and driver_profile:
                 driver_info = {
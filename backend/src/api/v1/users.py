@@ -4,6 +4,7 @@ User management API endpoints with improved naming and structured logging.
 
 from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, Form, BackgroundTasks
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 from typing import Optional, Dict, Any
 import logging
 from src.schemas.user import (
@@ -21,7 +22,7 @@ from src.core.settings import settings
 from src.services.users import UserService
 from src.services.auth import AuthService
 from src.services.realtime_location import RealtimeLocationService
-from src.db.session import get_session
+from src.db.session import get_session, get_async_db
 from src.schemas.auth import CurrentUser
 from src.models.enums import UserRole
 from src.models.user import User
@@ -251,6 +252,10 @@ async def update_profile(
             session.add(user_profiles[0])
             session.commit()
             session.refresh(user_profiles[0])
+            if "email" in shared_data:
+                UserService.invalidate_email_cache(
+                    user_profiles[0].auth_id, [user_profiles[0].phone_number]
+                )
             logger.info(f"Development mode: Updated user {user_profiles[0].id} directly")
             shared_result = {"success": True, "message": "Profile updated successfully"}
         else:
@@ -405,7 +410,7 @@ async def get_user_profiles(
 @router.post("/reset-password", response_model=PasswordResetResponse)
 async def reset_password(
     request: PasswordResetRequest,
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_db)
 ):
     """
     Reset user password using phone number.
@@ -422,7 +427,7 @@ async def reset_password(
     logger.info(f"Password reset requested for phone: {request.phone_number}")
     
     # Look up email by phone number from our users table
-    email = UserService.get_email_by_phone(session, request.phone_number)
+    email = await UserService.get_email_by_phone_async(session, request.phone_number)
     
     if not email:
         logger.warning(f"No email found for phone number: {request.phone_number}")
@@ -6,6 +6,7 @@ from src.api.v1 import router as v1_router
 from src.db.session import create_db_and_tables
 from src.core.security import APIKeyMiddleware, SecurityHeadersMiddleware
 from src.core.settings import settings
+from src.workers.utils import RedisPools
 
 
 @asynccontextmanager
@@ -16,7 +17,8 @@ async def lifespan(app: FastAPI):
     # create_db_and_tables()
     yield
     # Shutdown
-    pass
+    await RedisPools.disconnect_async()
+    RedisPools.disconnect_all()
 
 
 app = FastAPI(
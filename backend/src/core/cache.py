@@ -0,0 +1,83 @@
+"""
+Redis cache helpers.
+
+Caching is optional: when the `redis` extra is not installed or `TAXINI_REDIS_URL`
+is unset, every helper is a no-op and callers fall through to the database.
+Cache failures are logged and never propagate to the request.
+
+Clients come from the cache pools in `src.workers.utils.RedisPools`, so API and
+worker code in one process share a single bounded, fail-fast pool for cache traffic.
+"""
+
+import logging
+from typing import Optional
+from src.workers.utils import get_async_cache_client, get_cache_client
+
+logger = logging.getLogger(__name__)
+
+
+def get_async_redis():
+    """Get an asyncio Redis client on the shared cache pool, or None when caching is disabled."""
+    return get_async_cache_client()
+
+
+def get_sync_redis():
+    """Get a blocking Redis client on the shared cache pool, or None when caching is disabled."""
+    return get_cache_client()
+
+
+async def cache_get(key: str) -> Optional[str]:
+    """Read a cached value, returning None on a miss or when Redis is unavailable."""
+    client = get_async_redis()
+    if client is None:
+        return None
+    try:
+        return await client.get(key)
+    except Exception as e:
+        logger.warning(f"Cache GET failed for {key}: {e}")
+        return None
+
+
+async def cache_set(key: str, value: str, ttl: int) -> None:
+    """Store a value with a TTL in seconds."""
+    client = get_async_redis()
+    if client is None:
+        return
+    try:
+        await client.setex(key, ttl, value)
+    except Exception as e:
+        logger.warning(f"Cache SETEX failed for {key}: {e}")
+
+
+def cache_get_sync(key: str) -> Optional[str]:
+    """Blocking variant of cache_get for sync service methods."""
+    client = get_sync_redis()
+    if client is None:
+        return None
+    try:
+        return client.get(key)
+    except Exception as e:
+        logger.warning(f"Cache GET failed for {key}: {e}")
+        return None
+
+
+def cache_set_sync(key: str, value: str, ttl: int) -> None:
+    """Blocking variant of cache_set for sync service methods."""
+    client = get_sync_redis()
+    if client is None:
+        return
+    try:
+        client.setex(key, ttl, value)
+    except Exception as e:
+        logger.warning(f"Cache SETEX failed for {key}: {e}")
+
+
+def cache_delete_sync(*keys: str) -> None:
+    """Invalidate one or more keys."""
+    client = get_sync_redis()
+    if client is None or not keys:
+        return
+    try:
+        client.delete(*keys)
+    except Exception as e:
+        logger.warning(f"Cache DEL failed for {keys}: {e}")
@@ -13,10 +13,29 @@ class Settings(BaseSettings):
     supabase_url: Optional[str] = None
     supabase_api_key: Optional[str] = None
     supabase_storage_bucket: Optional[str] = "test"
+    max_upload_size_mb: int = 10  # Per-file limit for profile document uploads
     
     # Database Config (Supabase PostgreSQL)
     supabase_db_url: Optional[str] = None  # Direct Supabase PostgreSQL connection
     
+    # Connection pool config, applied to both the sync and the async engine. The defaults
+    # (2 x (3 + 4) = 14 connections) fit Supabase's 15-connection cap in session mode (:5432);
+    # raise them only behind a transaction-mode pooler (Supabase :6543 or PgBouncer)
+    db_pool_size: int = 3
+    db_max_overflow: int = 4
+    db_pool_timeout: int = 30  # Seconds to wait for a pooled connection
+    db_pool_recycle: int = 1800  # Recycle connections after 30 minutes
+    db_statement_timeout_ms: int = 30000  # Set per connection; 0 disables it
+    
+    # Cache config (requires the `redis` extra; caching is disabled when unset)
+    redis_url: Optional[str] = None
+    email_cache_ttl_seconds: int = 300
+    
+    # Background worker config (requires the `workers` extra; broker defaults to redis_url)
+    worker_broker_url: Optional[str] = None
+    worker_concurrency: int = 8  # Tasks are DB/Redis-bound, so roughly one slot per core
+    worker_prefetch: int = 1  # Reserve one task per slot so long tasks don't hold short ones
+    
     # API Security Config
     api_key: Optional[str] = None  # API key for request authentication
     
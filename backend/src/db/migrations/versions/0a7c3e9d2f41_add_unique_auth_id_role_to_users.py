@@ -0,0 +1,28 @@
+"""add_unique_auth_id_role_to_users
+
+Revision ID: 0a7c3e9d2f41
+Revises: 6e8ebe03791c
+Create Date: 2026-10-16 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0a7c3e9d2f41'
+down_revision: Union[str, Sequence[str], None] = '6e8ebe03791c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Enforce one profile per role for each auth user."""
+    op.create_unique_constraint('uq_users_auth_role', 'users', ['auth_id', 'role'])
+
+
+def downgrade() -> None:
+    """Remove the auth_id/role unique constraint."""
+    op.drop_constraint('uq_users_auth_role', 'users', type_='unique')
@@ -0,0 +1,37 @@
+"""add_partial_index_trips_rider_open
+
+Revision ID: 5b8e1f4c7a20
+Revises: 0a7c3e9d2f41
+Create Date: 2026-10-16 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b8e1f4c7a20'
+down_revision: Union[str, Sequence[str], None] = '0a7c3e9d2f41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add partial index on trips (rider_id) covering only open/unconfirmed trips."""
+    op.create_index(
+        'ix_trips_rider_open',
+        'trips',
+        ['rider_id'],
+        unique=False,
+        postgresql_where=sa.text(
+            "status IN ('requested', 'assigned', 'accepted', 'started') "
+            "OR (status = 'completed' AND rider_confirmed_completion = false)"
+        )
+    )
+
+
+def downgrade() -> None:
+    """Remove the partial index."""
+    op.drop_index('ix_trips_rider_open', table_name='trips')
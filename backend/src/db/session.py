@@ -2,13 +2,19 @@
 Database session and engine configuration.
 """
 
+import logging
 from sqlmodel import create_engine, SQLModel, Session
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy import URL, event, make_url
+from sqlalchemy.ext.asyncio import create_async_engine
 from sqlalchemy.orm import sessionmaker
-from typing import Generator, AsyncGenerator
+from sqlalchemy.pool import QueuePool
+from typing import Any, AsyncGenerator, Dict, Generator, Tuple
 from contextlib import asynccontextmanager
 from src.core.settings import settings
 
+logger = logging.getLogger(__name__)
+
 
 # Create sync engine
 def get_database_url() -> str:
@@ -36,29 +42,65 @@ def get_database_url() -> str:
 engine = create_engine(
     get_database_url(),
     echo=False,  # Set to True for development debugging
-    pool_pre_ping=True,
-    pool_recycle=300,  # Recycle connections after 5 minutes
-    # Supabase free tier limit: 15 connections max in Session mode
-    pool_size=3,  # Keep pool small for free tier
-    max_overflow=5,  # Allow some overflow (total max: 8 connections)
-    pool_timeout=30,  # Timeout for getting connection from pool
+    poolclass=QueuePool,
+    pool_pre_ping=True,  # Drop dead connections before handing them out
+    # Defaults fit Supabase's session-mode connection cap; see settings.db_pool_size
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_timeout=settings.db_pool_timeout,
+    pool_recycle=settings.db_pool_recycle,
     connect_args={
         "connect_timeout": 10,
-        # Performance optimizations
-        "options": "-c statement_timeout=30000"  # 30s query timeout
     }
 )
 
+
+@event.listens_for(engine, "connect")
+def _set_statement_timeout(dbapi_connection, connection_record):
+    """
+    Apply the query timeout once per new connection.
+
+    Sent as a SET rather than the `options` startup parameter, which PgBouncer
+    rejects unless `ignore_startup_parameters` lists it. Behind a transaction-mode
+    pooler, server connections are shared, so set it on the role instead
+    (`ALTER ROLE ... SET statement_timeout = '30s'`) and set the timeout to 0 here.
+    """
+    if engine.dialect.name != "postgresql" or not settings.db_statement_timeout_ms:
+        return
+    with dbapi_connection.cursor() as cursor:
+        cursor.execute(f"SET statement_timeout = {int(settings.db_statement_timeout_ms)}")
+    # psycopg2 opened a transaction for the SET; commit so the pool's reset doesn't undo it
+    dbapi_connection.commit()
+
+def get_async_database_url() -> Tuple[URL, Dict[str, Any]]:
+    """
+    Get the asyncpg URL and connect args for the async engine.
+    
+    libpq's `sslmode` query parameter is moved into asyncpg's `ssl` connect
+    argument; asyncpg.connect() has no `sslmode` and rejects it.
+    """
+    url = make_url(get_database_url())
+    sslmode = url.query.get("sslmode")
+    url = url.set(drivername="postgresql+asyncpg").difference_update_query(["sslmode"])
+    
+    connect_args: Dict[str, Any] = {}
+    if sslmode:
+        # asyncpg accepts the libpq mode names (disable, prefer, require, verify-ca, verify-full)
+        connect_args["ssl"] = sslmode
+    return url, connect_args
+
+
 # Create async engine for async operations
+_async_url, _async_connect_args = get_async_database_url()
 async_engine = create_async_engine(
-    get_database_url().replace("postgresql://", "postgresql+asyncpg://"),
+    _async_url,
+    connect_args=_async_connect_args,
     echo=False,
     pool_pre_ping=True,
-    pool_recycle=300,  # Recycle connections after 5 minutes
-    # Supabase free tier limit: 15 connections max in Session mode
-    pool_size=3,  # Keep pool small for free tier
-    max_overflow=4,  # Allow some overflow (total max: 7 connections)
-    pool_timeout=30
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_timeout=settings.db_pool_timeout,
+    pool_recycle=settings.db_pool_recycle
 )
 
 # Session factories
@@ -74,6 +116,12 @@ def get_session() -> Generator[Session, None, None]:
         yield session
 
 
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """Dependency to get async database session for non-blocking read endpoints."""
+    async with AsyncSessionLocal() as session:
+        yield session
+
+
 @asynccontextmanager
 async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
     """Async context manager to get database session."""
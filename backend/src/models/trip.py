@@ -7,7 +7,7 @@ and its assignment to a driver.
 
 from typing import Optional
 from sqlmodel import Field, SQLModel, Relationship
-from sqlalchemy import Column, String, Float, DateTime, Text
+from sqlalchemy import Column, String, Float, DateTime, Text, Index, text
 from datetime import datetime
 from .mixins import TimestampMixin, UUIDMixin
 
@@ -68,6 +68,18 @@ class TripBase(SQLModel):
 class Trip(TripBase, UUIDMixin, TimestampMixin, table=True):
     """Trip table - represents a ride request and its lifecycle."""
     __tablename__ = "trips"
+    __table_args__ = (
+        # Partial index for the rider active-trip lookup; confirmed/cancelled history is excluded
+        # so the index stays small as the archive grows (matches TripService.get_rider_active_trip)
+        Index(
+            'ix_trips_rider_open',
+            'rider_id',
+            postgresql_where=text(
+                "status IN ('requested', 'assigned', 'accepted', 'started') "
+                "OR (status = 'completed' AND rider_confirmed_completion = false)"
+            ),
+        ),
+    )
     
     # Use string columns for status to avoid enum issues
     status: str = Field(sa_column=Column(String(20), name="status"))
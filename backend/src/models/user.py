@@ -6,10 +6,13 @@ This module contains the base User model and role-specific extensions.
 
 from typing import Optional, List
 from sqlmodel import Field, SQLModel, Relationship
-from sqlalchemy import Column, String
+from sqlalchemy import Column, String, UniqueConstraint
 from .enums import UserRole, DriverAccountStatus, DriverStatus
 from .mixins import TimestampMixin, UUIDMixin
 
+# Name of the one-profile-per-role constraint; services match on it to report duplicates
+DUPLICATE_ROLE_CONSTRAINT = "uq_users_auth_role"
+
 
 class UserBase(SQLModel):
     """Base user fields shared across create/update/read operations."""
@@ -23,6 +26,10 @@ class UserBase(SQLModel):
 class User(UserBase, UUIDMixin, TimestampMixin, table=True):
     """Main user table - parent table for all user types."""
     __tablename__ = "users"
+    __table_args__ = (
+        # One profile per role for each auth user
+        UniqueConstraint('auth_id', 'role', name=DUPLICATE_ROLE_CONSTRAINT),
+    )
     
     role: str = Field(sa_column=Column(String(20), name="role"))
     auth_status: str = Field(default="pending", sa_column=Column(String(20), name="auth_status"))
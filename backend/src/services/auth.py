@@ -2,8 +2,13 @@
 Authentication service using Supabase Auth with normalized responses.
 """
 
+import copy
+import hashlib
 import logging
-from typing import Optional, Dict, Any
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Tuple
 from fastapi import Header, HTTPException, Cookie
 from gotrue.errors import AuthError
 
@@ -12,6 +17,94 @@ from src.schemas.auth import CurrentUser
 
 logger = logging.getLogger(__name__)
 
+# Verified development-JWT claims, keyed by a digest of (token, secret, algorithm).
+# Each request re-sends the same bearer token, so skip the HMAC verify for a short window.
+_TOKEN_CACHE_TTL_SECONDS = 120
+_TOKEN_CACHE_MAX_SIZE = 256
+
+
+class _TokenCache:
+    """
+    Bounded TTL cache of verified JWT claims.
+
+    Request handlers run on the threadpool, so every access holds the lock.
+    Entries hold their own copy of the claims and hand out copies, so callers
+    can never mutate what the next request is served.
+    """
+
+    def __init__(self, max_size: int):
+        self._max_size = max_size
+        self._entries: OrderedDict[str, Tuple[float, Dict[str, Any]]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, now: float) -> Optional[Dict[str, Any]]:
+        """Return a copy of the cached claims for `key`, dropping the entry if it has expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= now:
+                del self._entries[key]
+                return None
+            payload = entry[1]
+        return copy.deepcopy(payload)
+
+    def set(self, key: str, expires_at: float, payload: Dict[str, Any]) -> None:
+        """Store a copy of the claims until `expires_at`, evicting the oldest entry when full."""
+        payload = copy.deepcopy(payload)
+        with self._lock:
+            self._entries[key] = (expires_at, payload)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every cached entry."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+_verified_tokens = _TokenCache(_TOKEN_CACHE_MAX_SIZE)
+
+
+def _token_cache_key(access_token: str, secret: str, algorithm: str) -> str:
+    """
+    Digest the token with the key material it was verified against.
+
+    A rotated secret or algorithm therefore misses the cache and re-verifies,
+    and the secret itself is never stored.
+    """
+    material = "\0".join((algorithm, secret, access_token)).encode()
+    return hashlib.sha256(material).hexdigest()
+
+
+def _decode_dev_token(access_token: str, secret: str, algorithm: str) -> Dict[str, Any]:
+    """
+    Decode a development JWT, reusing claims verified in the last two minutes.
+
+    Cached claims are never served past the token's own `exp`. Raises the same
+    jwt exceptions as jwt.decode on a miss.
+    """
+    import jwt
+
+    key = _token_cache_key(access_token, secret, algorithm)
+    now = time.time()
+    cached = _verified_tokens.get(key, now)
+    if cached is not None:
+        return cached
+
+    payload = jwt.decode(access_token, secret, algorithms=[algorithm])
+
+    expires_at = now + _TOKEN_CACHE_TTL_SECONDS
+    if isinstance(payload.get("exp"), (int, float)):
+        expires_at = min(expires_at, payload["exp"])
+    _verified_tokens.set(key, expires_at, payload)
+    return payload
+
 
 def _normalize_session_dict(session_data: Any) -> Dict[str, Any]:
     """
@@ -219,11 +312,11 @@ class AuthService:
             # Development mode: validate custom JWT token
             if settings.development_mode:
                 try:
-                    # Decode JWT token
-                    payload = jwt.decode(
-                        access_token, 
-                        settings.jwt_secret, 
-                        algorithms=[settings.jwt_algorithm]
+                    # Decode JWT token (verified claims are cached briefly)
+                    payload = _decode_dev_token(
+                        access_token,
+                        settings.jwt_secret,
+                        settings.jwt_algorithm
                     )
                     
                     # Extract user info from token payload
@@ -19,6 +19,7 @@ import logging
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlalchemy import and_, or_
 
 from src.models.user import User, Driver, Rider
@@ -30,6 +31,17 @@ from src.services.notification import NotificationService
 
 logger = logging.getLogger(__name__)
 
+# Trip statuses that count as "active" for the driver and rider dashboards
+_ACTIVE_DRIVER_STATUSES: tuple[str, ...] = (
+    TripStatus.ASSIGNED.value,
+    TripStatus.ACCEPTED.value,
+    TripStatus.STARTED.value,
+)
+_ACTIVE_RIDER_STATUSES: tuple[str, ...] = (
+    TripStatus.REQUESTED.value,
+    *_ACTIVE_DRIVER_STATUSES,
+)
+
 
 class TripService:
     """Service for managing trip operations and driver-rider matching with Supabase integration."""
@@ -742,6 +754,17 @@ class TripService:
                 "message": f"Failed to reject trip: {str(e)}"
             }
 
+    @staticmethod
+    def _driver_active_trip_query(driver_user_id: str):
+        """Build the active trip query (assigned, accepted, or started) for a driver's user ID."""
+        # Using .in_() automatically excludes cancelled and completed
+        return select(Trip).where(
+            and_(
+                Trip.driver_id == driver_user_id,
+                Trip.status.in_(_ACTIVE_DRIVER_STATUSES)
+            )
+        ).order_by(Trip.requested_at.desc())
+
     @staticmethod
     def get_driver_active_trip(session: Session, driver_id: str) -> Optional[Trip]:
         """
@@ -758,22 +781,43 @@ class TripService:
         if not driver:
             return None
         
-        # Get active trip (assigned, accepted, or started)
-        # Using .in_() automatically excludes cancelled and completed
-        trip = session.exec(
-            select(Trip).where(
-                and_(
-                    Trip.driver_id == driver.user_id,
-                    Trip.status.in_([
-                        TripStatus.ASSIGNED.value, 
-                        TripStatus.ACCEPTED.value, 
-                        TripStatus.STARTED.value
-                    ])
-                )
-            ).order_by(Trip.requested_at.desc())
-        ).first()
+        return session.exec(TripService._driver_active_trip_query(driver.user_id)).first()
+
+    @staticmethod
+    async def get_driver_active_trip_async(session: AsyncSession, driver_id: str) -> Optional[Trip]:
+        """
+        Get the active trip for a driver without blocking the event loop.
+        
+        Args:
+            session: Async database session
+            driver_id: ID of the driver
+            
+        Returns:
+            Active trip or None (explicitly excludes cancelled and completed trips)
+        """
+        driver = (await session.exec(select(Driver).where(Driver.id == driver_id))).first()
+        if not driver:
+            return None
         
-        return trip
+        result = await session.exec(TripService._driver_active_trip_query(driver.user_id))
+        return result.first()
+
+    @staticmethod
+    def _rider_active_trip_query(rider_id: str):
+        """Build the active trip query for a rider, including unconfirmed completed trips."""
+        return select(Trip).where(
+            and_(
+                Trip.rider_id == rider_id,
+                or_(
+                    Trip.status.in_(_ACTIVE_RIDER_STATUSES),
+                    # Include completed trips that haven't been confirmed yet
+                    and_(
+                        Trip.status == TripStatus.COMPLETED.value,
+                        Trip.rider_confirmed_completion == False
+                    )
+                )
+            )
+        )
 
     @staticmethod
     def get_rider_active_trip(session: Session, rider_id: str) -> Optional[Trip]:
@@ -788,23 +832,19 @@ class TripService:
         Returns:
             Active trip or None
         """
-        trip = session.exec(
-            select(Trip).where(
-                and_(
-                    Trip.rider_id == rider_id,
-                    or_(
-                        Trip.status == TripStatus.REQUESTED.value,
-                        Trip.status == TripStatus.ASSIGNED.value,
-                        Trip.status == TripStatus.ACCEPTED.value,
-                        Trip.status == TripStatus.STARTED.value,
-                        # Include completed trips that haven't been confirmed yet
-                        and_(
-                            Trip.status == TripStatus.COMPLETED.value,
-                            Trip.rider_confirmed_completion == False
-                        )
-                    )
-                )
-            )
-        ).first()
+        return session.exec(TripService._rider_active_trip_query(rider_id)).first()
+
+    @staticmethod
+    async def get_rider_active_trip_async(session: AsyncSession, rider_id: str) -> Optional[Trip]:
+        """
+        Get the active trip for a rider without blocking the event loop.
         
-        return trip
+        Args:
+            session: Async database session
+            rider_id: ID of the rider
+            
+        Returns:
+            Active trip or None
+        """
+        result = await session.exec(TripService._rider_active_trip_query(rider_id))
+        return result.first()
@@ -2,18 +2,110 @@
 User management service.
 """
 
-from typing import Dict, Any, Optional, List
+import asyncio
+from typing import Any, Awaitable, Dict, Iterable, List, Optional
 from sqlmodel import Session, select
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload
+from sqlmodel.ext.asyncio.session import AsyncSession
 from fastapi import UploadFile, HTTPException
+from starlette.concurrency import run_in_threadpool
 import logging
-from src.models.user import User, Rider, Driver
+from src.models.user import User, Rider, Driver, Admin, DUPLICATE_ROLE_CONSTRAINT
 from src.models.enums import UserRole
 from src.db.session import get_session
 from src.core.settings import settings
+from src.core.cache import cache_get, cache_set, cache_get_sync, cache_set_sync, cache_delete_sync
 from src.services.supabase_client import upload_file_to_bucket
 
 logger = logging.getLogger(__name__)
 
+# Redis keys for the password-reset email lookups
+EMAIL_BY_PHONE_KEY = "email:phone:{}"
+EMAIL_BY_AUTH_ID_KEY = "email:authid:{}"
+
+# session.info key for the per-request get_user_by_auth_id memo
+USER_BY_AUTH_ID_CACHE = "users_by_auth_id"
+
+# Read size for chunked uploads (size-cap check granularity)
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1 MiB
+
+# Fields shared by every profile (rider/driver/admin) of one auth user
+SHARED_PROFILE_FIELDS = frozenset({"name", "email"})
+
+# User columns the cached email lookups are keyed on or return
+EMAIL_CACHE_FIELDS = frozenset({"email", "phone_number"})
+
+# Columns update_user_profile may write; anything else in the payload is ignored
+USER_UPDATABLE_FIELDS = frozenset({"name", "email", "phone_number", "auth_status"})
+
+# Role dispatch tables: adding a role means adding one entry to each
+ROLE_TABLE = {
+    "rider": Rider,
+    "driver": Driver,
+    "admin": Admin,
+}
+
+# User relationship holding each role's profile
+ROLE_PROFILE_ATTR = {
+    "rider": "rider_profile",
+    "driver": "driver_profile",
+    "admin": "admin_profile",
+}
+
+# Role-specific columns and their defaults when creating a profile
+ROLE_DEFAULTS = {
+    "rider": {"residence_place": ""},
+    "driver": {
+        "id_card": "",
+        "driver_license": "",
+        "taxi_number": "",
+        "account_status": "locked",  # Default to locked
+        "driver_status": "offline",  # Default to offline
+    },
+    "admin": {"test_column": None},
+}
+
+ROLE_UPDATABLE_FIELDS = {
+    "rider": frozenset({"residence_place"}),
+    "driver": frozenset({
+        "id_card", "driver_license", "taxi_number", "account_status", "driver_status"
+    }),
+    "admin": frozenset({"test_column"}),
+}
+
+# Role-specific fields exposed in API responses
+ROLE_PROFILE_FIELDS = {
+    "rider": ("residence_place",),
+    "driver": ("id_card", "driver_license", "taxi_number"),
+    "admin": ("test_column",),
+}
+
+# Role-specific fields listed by get_all_user_profiles_with_data (rider/driver only)
+ROLE_SUMMARY_FIELDS = {
+    "rider": ("residence_place",),
+    "driver": ("id_card", "driver_license", "taxi_number", "account_status"),
+}
+
+
+async def _gather_or_cancel(coros: Iterable[Awaitable[Any]]) -> List[Any]:
+    """
+    Run awaitables concurrently; on the first failure cancel the rest and re-raise it.
+
+    Unlike a TaskGroup the original exception (e.g. an HTTPException) propagates
+    as-is rather than wrapped in an ExceptionGroup. A threadpool call that is
+    already running finishes in its thread, but its result is discarded.
+    """
+    tasks = [asyncio.ensure_future(coro) for coro in coros]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
 
 class UserService:
     """Service for managing user profiles and operations."""
@@ -45,21 +137,7 @@ class UserService:
             Dict containing created user information
         """
         try:
-            # Check if user already has this specific role
-            existing_user_with_role = session.exec(
-                select(User).where(
-                    User.auth_id == auth_id,
-                    User.role == role.value
-                )
-            ).first()
-            
-            if existing_user_with_role:
-                role_name = "driver" if role.value == "driver" else "rider"
-                return {
-                    "success": False,
-                    "message": f"This number is already associated with a {role_name} profile",
-                    "error": f"DUPLICATE_{role_name.upper()}_PROFILE"
-                }
+            # Duplicate roles are rejected by the uq_users_auth_role constraint on insert
             
             # Check if trying to create admin profile (not allowed for regular users)
             if role.value == "admin":
@@ -100,36 +178,20 @@ class UserService:
             )
             
             session.add(user)
-            session.commit()
-            session.refresh(user)
+            # Flush surfaces constraint violations now; user and role profile commit together below
+            session.flush()
 
             # Create role-specific profile
             role_profile = None
-            if role.value == "rider":
-                rider_data = role_specific_data or {}
-                role_profile = Rider(
-                    user_id=user.id,
-                    residence_place=rider_data.get("residence_place", "")
-                )
-                session.add(role_profile)
-                
-            elif role.value == "driver":
-                driver_data = role_specific_data or {}
-                role_profile = Driver(
-                    user_id=user.id,
-                    id_card=driver_data.get("id_card", ""),
-                    driver_license=driver_data.get("driver_license", ""),
-                    taxi_number=driver_data.get("taxi_number", ""),
-                    account_status=driver_data.get("account_status", "locked"),  # Default to locked
-                    driver_status=driver_data.get("driver_status", "offline")  # Default to offline
-                )
-                session.add(role_profile)
-                
-            elif role.value == "admin":
-                admin_data = role_specific_data or {}
-                role_profile = Admin(
+            model_cls = ROLE_TABLE.get(role.value)
+            if model_cls:
+                profile_data = role_specific_data or {}
+                role_profile = model_cls(
                     user_id=user.id,
-                    test_column=admin_data.get("test_column")
+                    **{
+                        field: profile_data.get(field, default)
+                        for field, default in ROLE_DEFAULTS[role.value].items()
+                    }
                 )
                 session.add(role_profile)
 
@@ -142,6 +204,24 @@ class UserService:
                 "role_profile": role_profile
             }
             
+        except IntegrityError as e:
+            session.rollback()
+            # Other unique columns (e.g. phone_number) may trip first, so confirm the role exists
+            if DUPLICATE_ROLE_CONSTRAINT in str(e.orig) or session.exec(
+                select(User.id).where(User.auth_id == auth_id, User.role == role.value)
+            ).first():
+                role_name = "driver" if role.value == "driver" else "rider"
+                return {
+                    "success": False,
+                    "message": f"This number is already associated with a {role_name} profile",
+                    "error": f"DUPLICATE_{role_name.upper()}_PROFILE"
+                }
+            return {
+                "success": False,
+                "message": f"Failed to create user profile: {str(e)}",
+                "error": str(e)
+            }
+            
         except Exception as e:
             session.rollback()
             return {
@@ -162,9 +242,40 @@ class UserService:
         Returns:
             User object if found, None otherwise
         """
-        return session.exec(
-            select(User).where(User.auth_id == auth_id)
-        ).first()
+        # Sessions are request-scoped, so session.info memoizes lookups for one request.
+        # Misses are not cached in case the profile is created later in the request.
+        cache = session.info.setdefault(USER_BY_AUTH_ID_CACHE, {})
+        user = cache.get(auth_id)
+        if user is None:
+            user = session.exec(
+                select(User).where(User.auth_id == auth_id)
+            ).first()
+            if user is not None:
+                cache[auth_id] = user
+        return user
+
+    @staticmethod
+    async def get_user_by_auth_id_async(session: AsyncSession, auth_id: str) -> Optional[User]:
+        """
+        Get user by Supabase auth ID without blocking the event loop.
+        
+        Args:
+            session: Async database session
+            auth_id: Supabase auth user ID
+            
+        Returns:
+            User object if found, None otherwise
+        """
+        cache = session.info.setdefault(USER_BY_AUTH_ID_CACHE, {})
+        user = cache.get(auth_id)
+        if user is None:
+            result = await session.exec(
+                select(User).where(User.auth_id == auth_id)
+            )
+            user = result.first()
+            if user is not None:
+                cache[auth_id] = user
+        return user
 
     @staticmethod
     def get_user_profiles_by_auth_id(session: Session, auth_id: str) -> List[User]:
@@ -196,7 +307,7 @@ class UserService:
             User profile for the specified role, None if not found
         """
         return session.exec(
-            select(User).where(User.auth_id == auth_id, User.role == role)
+            select(User).where(User.auth_id == auth_id, User.role == role.value)
         ).first()
 
     @staticmethod
@@ -211,14 +322,14 @@ class UserService:
         Returns:
             Dict with email and name if found, None otherwise
         """
-        existing_user = session.exec(
-            select(User).where(User.auth_id == auth_id)
+        row = session.exec(
+            select(User.email, User.name).where(User.auth_id == auth_id)
         ).first()
         
-        if existing_user:
+        if row:
             return {
-                "email": existing_user.email,
-                "name": existing_user.name
+                "email": row[0],
+                "name": row[1]
             }
         return None
 
@@ -243,17 +354,10 @@ class UserService:
                 }
 
             role_profile = None
-            if user.role == "rider":
+            model_cls = ROLE_TABLE.get(user.role)
+            if model_cls:
                 role_profile = session.exec(
-                    select(Rider).where(Rider.user_id == user_id)
-                ).first()
-            elif user.role == "driver":
-                role_profile = session.exec(
-                    select(Driver).where(Driver.user_id == user_id)
-                ).first()
-            elif user.role == "admin":
-                role_profile = session.exec(
-                    select(Admin).where(Admin.user_id == user_id)
+                    select(model_cls).where(model_cls.user_id == user_id)
                 ).first()
 
             return {
@@ -289,7 +393,13 @@ class UserService:
             Dict containing update result
         """
         try:
-            user = session.get(User, user_id)
+            stmt = select(User).where(User.id == user_id)
+            if role_data:
+                # Fetch the role profile in the same round-trip as the user
+                stmt = stmt.options(
+                    *(joinedload(getattr(User, attr)) for attr in ROLE_PROFILE_ATTR.values())
+                )
+            user = session.exec(stmt).first()
             if not user:
                 return {
                     "success": False,
@@ -297,41 +407,25 @@ class UserService:
                 }
 
             # Update user fields
-            for field, value in user_data.items():
-                if hasattr(user, field):
-                    setattr(user, field, value)
+            old_phone_number = user.phone_number
+            updates = {k: v for k, v in user_data.items() if k in USER_UPDATABLE_FIELDS}
+            user.sqlmodel_update(updates)
 
             # Update role-specific profile if provided
-            if role_data:
-                if user.role == UserRole.RIDER:
-                    rider = session.exec(
-                        select(Rider).where(Rider.user_id == user_id)
-                    ).first()
-                    if rider:
-                        for field, value in role_data.items():
-                            if hasattr(rider, field):
-                                setattr(rider, field, value)
-                                
-                elif user.role == UserRole.DRIVER:
-                    driver = session.exec(
-                        select(Driver).where(Driver.user_id == user_id)
-                    ).first()
-                    if driver:
-                        for field, value in role_data.items():
-                            if hasattr(driver, field):
-                                setattr(driver, field, value)
-                                
-                elif user.role == UserRole.ADMIN:
-                    admin = session.exec(
-                        select(Admin).where(Admin.user_id == user_id)
-                    ).first()
-                    if admin:
-                        for field, value in role_data.items():
-                            if hasattr(admin, field):
-                                setattr(admin, field, value)
+            profile_attr = ROLE_PROFILE_ATTR.get(user.role)
+            if role_data and profile_attr:
+                role_profile = getattr(user, profile_attr)
+                if role_profile:
+                    allowed_fields = ROLE_UPDATABLE_FIELDS[user.role]
+                    role_profile.sqlmodel_update(
+                        {k: v for k, v in role_data.items() if k in allowed_fields}
+                    )
 
             session.commit()
             
+            if updates.keys() & EMAIL_CACHE_FIELDS:
+                UserService.invalidate_email_cache(user.auth_id, [old_phone_number, user.phone_number])
+            
             return {
                 "success": True,
                 "message": "User profile updated successfully",
@@ -386,24 +480,15 @@ class UserService:
                 }
                 
                 # Get role-specific data
-                if user.role == "rider":
-                    rider = session.exec(
-                        select(Rider).where(Rider.user_id == user.id)
+                summary_fields = ROLE_SUMMARY_FIELDS.get(user.role)
+                if summary_fields:
+                    model_cls = ROLE_TABLE[user.role]
+                    role_profile = session.exec(
+                        select(model_cls).where(model_cls.user_id == user.id)
                     ).first()
-                    if rider:
+                    if role_profile:
                         profile_data["role_specific_data"] = {
-                            "residence_place": rider.residence_place
-                        }
-                elif user.role == "driver":
-                    driver = session.exec(
-                        select(Driver).where(Driver.user_id == user.id)
-                    ).first()
-                    if driver:
-                        profile_data["role_specific_data"] = {
-                            "id_card": driver.id_card,
-                            "driver_license": driver.driver_license,
-                            "taxi_number": driver.taxi_number,
-                            "account_status": driver.account_status
+                            field: getattr(role_profile, field) for field in summary_fields
                         }
                 
                 profiles.append(profile_data)
@@ -422,16 +507,34 @@ class UserService:
             }
 
     @staticmethod
-    async def handle_file_upload(file: Optional[UploadFile], file_type: str) -> Optional[str]:
-        """Handle file upload and return URL or raise error."""
-        if not file:
-            return None
-            
+    async def read_upload(file: UploadFile, file_type: str) -> bytes:
+        """Read an uploaded file, raising 413 once it exceeds the configured size cap."""
+        # Read in fixed-size chunks to enforce the size cap as soon as it is exceeded;
+        # the accepted file is still held in memory before it is handed to storage
+        max_bytes = settings.max_upload_size_mb * 1024 * 1024
+        chunks = []
+        size = 0
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            size += len(chunk)
+            if size > max_bytes:
+                raise HTTPException(
+                    status_code=413,
+                    detail=f"{file_type} file exceeds {settings.max_upload_size_mb} MB limit"
+                )
+            chunks.append(chunk)
+        
+        return b"".join(chunks)
+
+    @staticmethod
+    async def upload_content(content: bytes, filename: str, file_type: str) -> str:
+        """Upload already-read file content and return its URL or raise error."""
         bucket = settings.supabase_storage_bucket
-        logger.info(f"Uploading {file_type}: {file.filename}")
+        logger.info(f"Uploading {file_type}: {filename}")
         
-        content = await file.read()
-        file_url = upload_file_to_bucket(bucket, content, file.filename)
+        # The Supabase storage client is blocking; keep it off the event loop
+        file_url = await run_in_threadpool(
+            upload_file_to_bucket, bucket, content, filename
+        )
         
         logger.info(f"{file_type} upload result: {file_url}")
         if not file_url:
@@ -442,6 +545,15 @@ class UserService:
         
         return file_url
 
+    @staticmethod
+    async def handle_file_upload(file: Optional[UploadFile], file_type: str) -> Optional[str]:
+        """Handle file upload and return URL or raise error."""
+        if not file:
+            return None
+        
+        content = await UserService.read_upload(file, file_type)
+        return await UserService.upload_content(content, file.filename, file_type)
+
     @staticmethod
     async def prepare_rider_data(residence_place: Optional[str]) -> Dict[str, Any]:
         """Prepare rider-specific profile data."""
@@ -462,14 +574,22 @@ class UserService:
         """Prepare driver-specific profile data with file uploads."""
         role_data = {}
         
-        # Handle file uploads
-        id_card_url = await UserService.handle_file_upload(id_card_file, "id_card")
-        if id_card_url:
-            role_data["id_card"] = id_card_url
-        
-        driver_license_url = await UserService.handle_file_upload(driver_license_file, "driver_license")
-        if driver_license_url:
-            role_data["driver_license"] = driver_license_url
+        # Read every provided file before uploading any, so a file over the size cap
+        # rejects the signup without leaving its sibling in storage
+        files = {
+            field: file
+            for field, file in (("id_card", id_card_file), ("driver_license", driver_license_file))
+            if file
+        }
+        if files:
+            contents = await _gather_or_cancel(
+                UserService.read_upload(file, field) for field, file in files.items()
+            )
+            urls = await _gather_or_cancel(
+                UserService.upload_content(content, file.filename, field)
+                for (field, file), content in zip(files.items(), contents, strict=True)
+            )
+            role_data.update(zip(files, urls, strict=True))
         
         # Handle text fields
         if taxi_number:
@@ -494,16 +614,8 @@ class UserService:
         }
         
         # Add role-specific fields
-        if user.role == UserRole.RIDER:
-            role_profile_dict["residence_place"] = role_profile.residence_place
-        elif user.role == UserRole.DRIVER:
-            role_profile_dict.update({
-                "id_card": role_profile.id_card,
-                "driver_license": role_profile.driver_license,
-                "taxi_number": role_profile.taxi_number
-            })
-        elif user.role == UserRole.ADMIN:
-            role_profile_dict["test_column"] = role_profile.test_column
+        for field in ROLE_PROFILE_FIELDS.get(str(user.role), ()):
+            role_profile_dict[field] = getattr(role_profile, field)
         
         return role_profile_dict
 
@@ -525,14 +637,57 @@ class UserService:
         try:
             logger.info(f"Looking up email for phone number: {phone_number}")
             
-            # Find user by phone number (any profile will do since email is shared)
-            user = session.exec(
-                select(User).where(User.phone_number == phone_number)
+            cache_key = EMAIL_BY_PHONE_KEY.format(phone_number)
+            cached_email = cache_get_sync(cache_key)
+            if cached_email:
+                return cached_email
+            
+            # Find email by phone number (any profile will do since email is shared)
+            email = session.exec(
+                select(User.email).where(User.phone_number == phone_number)
             ).first()
             
-            if user:
-                logger.info(f"Found email for phone {phone_number}: {user.email}")
-                return user.email
+            if email:
+                logger.info(f"Found email for phone {phone_number}: {email}")
+                cache_set_sync(cache_key, email, settings.email_cache_ttl_seconds)
+                return email
+            else:
+                logger.warning(f"No user found with phone number: {phone_number}")
+                return None
+                
+        except Exception as e:
+            logger.error(f"Error looking up email by phone: {e}")
+            return None
+
+    @staticmethod
+    async def get_email_by_phone_async(session: AsyncSession, phone_number: str) -> Optional[str]:
+        """
+        Get user email by phone number without blocking the event loop.
+        
+        Args:
+            session: Async database session
+            phone_number: User's phone number
+            
+        Returns:
+            Email address if found, None otherwise
+        """
+        try:
+            logger.info(f"Looking up email for phone number: {phone_number}")
+            
+            cache_key = EMAIL_BY_PHONE_KEY.format(phone_number)
+            cached_email = await cache_get(cache_key)
+            if cached_email:
+                return cached_email
+            
+            result = await session.exec(
+                select(User.email).where(User.phone_number == phone_number)
+            )
+            email = result.first()
+            
+            if email:
+                logger.info(f"Found email for phone {phone_number}: {email}")
+                await cache_set(cache_key, email, settings.email_cache_ttl_seconds)
+                return email
             else:
                 logger.warning(f"No user found with phone number: {phone_number}")
                 return None
@@ -556,14 +711,20 @@ class UserService:
         try:
             logger.info(f"Looking up email for auth_id: {auth_id}")
             
-            # Find user by auth_id (any profile will do since email is shared)
-            user = session.exec(
-                select(User).where(User.auth_id == auth_id)
+            cache_key = EMAIL_BY_AUTH_ID_KEY.format(auth_id)
+            cached_email = cache_get_sync(cache_key)
+            if cached_email:
+                return cached_email
+            
+            # Find email by auth_id (any profile will do since email is shared)
+            email = session.exec(
+                select(User.email).where(User.auth_id == auth_id)
             ).first()
             
-            if user:
-                logger.info(f"Found email for auth_id {auth_id}: {user.email}")
-                return user.email
+            if email:
+                logger.info(f"Found email for auth_id {auth_id}: {email}")
+                cache_set_sync(cache_key, email, settings.email_cache_ttl_seconds)
+                return email
             else:
                 logger.warning(f"No user found with auth_id: {auth_id}")
                 return None
@@ -572,6 +733,23 @@ class UserService:
             logger.error(f"Error looking up email by auth_id: {e}")
             return None
 
+    @staticmethod
+    def invalidate_email_cache(auth_id: Optional[str], phone_numbers: List[Optional[str]]) -> None:
+        """
+        Drop cached password-reset email lookups after an email or phone number write.
+        
+        Every path that changes User.email or User.phone_number must call this,
+        otherwise the old email is served until the cache TTL expires.
+        
+        Args:
+            auth_id: Supabase auth user ID of the updated user
+            phone_numbers: Phone numbers whose lookups may now be stale (old and new)
+        """
+        keys = {EMAIL_BY_PHONE_KEY.format(phone) for phone in phone_numbers if phone}
+        if auth_id:
+            keys.add(EMAIL_BY_AUTH_ID_KEY.format(auth_id))
+        cache_delete_sync(*keys)
+
     @staticmethod
     def update_shared_data_across_profiles(
         session: Session,
@@ -590,30 +768,40 @@ class UserService:
             Dict containing update result
         """
         try:
-            # Get all user profiles for this auth_id
-            user_profiles = session.exec(
-                select(User).where(User.auth_id == auth_id)
-            ).all()
+            # Whitelist shared fields to avoid mass-assignment
+            updates = {
+                field: value for field, value in shared_data.items()
+                if field in SHARED_PROFILE_FIELDS
+            }
+            
+            if updates:
+                # Single UPDATE ... RETURNING instead of loading and flushing every profile
+                rows = session.execute(
+                    update(User)
+                    .where(User.auth_id == auth_id)
+                    .values(**updates)
+                    .returning(User.role, User.phone_number)
+                ).all()
+            else:
+                rows = session.exec(
+                    select(User.role, User.phone_number).where(User.auth_id == auth_id)
+                ).all()
             
-            if not user_profiles:
+            if not rows:
+                session.rollback()
                 return {
                     "success": False,
                     "message": "No profiles found for this user"
                 }
             
-            updated_profiles = []
-            
-            # Update shared data across all profiles
-            for user in user_profiles:
-                for field, value in shared_data.items():
-                    if hasattr(user, field) and field in ["name", "email"]:
-                        setattr(user, field, value)
-                        logger.info(f"Updated {field} to '{value}' for {user.role} profile (ID: {user.id})")
-                
-                updated_profiles.append(user.role)
+            updated_profiles = [role for role, _ in rows]
+            logger.info(f"Updated {list(updates)} for {updated_profiles} profiles of {auth_id}")
             
             session.commit()
             
+            if "email" in updates:
+                UserService.invalidate_email_cache(auth_id, [phone_number for _, phone_number in rows])
+            
             return {
                 "success": True,
                 "message": f"Shared data updated across {len(updated_profiles)} profiles",
@@ -647,9 +835,9 @@ class UserService:
         """
         try:
             # Get driver record
-            stmt = select(Driver).join(User).where(User.id == driver_id)
-            result = session.exec(stmt)
-            driver = result.first()
+            driver = session.exec(
+                select(Driver).where(Driver.user_id == driver_id)
+            ).first()
             
             if not driver:
                 return {
@@ -664,7 +852,6 @@ class UserService:
             driver.driver_status = new_status
             session.add(driver)
             session.commit()
-            session.refresh(driver)
             
             logger.info(f"Updated driver {driver_id} status from {old_status} to {new_status}")
             
@@ -1,9 +1,7 @@
 """
 Taxini Workers package.
 
-This package is intentionally left without concrete implementations. It documents
-how background processing should be organized for the Taxini backend as the
-project evolves.
+Background processing for the Taxini backend, kept out of the HTTP request path.
 
 Scope and responsibilities:
 - Run asynchronous/long-running jobs that should not block HTTP requests
@@ -12,23 +10,27 @@ Scope and responsibilities:
 - Consume events from streams/queues (e.g., Kafka, SQS, Pub/Sub, Redis streams).
 - Execute compute-heavy tasks out-of-band (e.g., route/ETA estimation, geo clustering).
 
-Recommended layout (create files as needed):
-- taxini/workers/
+Layout:
+- src/workers/
   - runner.py
-    - Process entrypoint for the worker (e.g., `uv run -- python -m taxini.workers.runner`)
-    - Bootstraps configuration, logging, and the chosen worker framework
-    - Starts queue consumers and/or schedulers
+    - Process entrypoint: `uv run -- python -m src.workers.runner` execs a Celery worker
+      (`-Ofair`, prefetch multiplier 1) when the `workers` extra is installed
+    - `run_consumer` runs a stream consumer until SIGTERM/SIGINT, then drains and
+      closes the consumer, Redis pools and HTTP client
+  - consumers/
+    - `BatchConsumer` (consumers/base.py): batches polled records, commits once per
+      handled batch, and can prefetch on a background fetcher thread
   - tasks/
-    - Domain-specific task modules (e.g., notifications.py, payments.py, geo.py)
+    - Domain-specific task modules; tasks/notifications.py fans push notifications out
+      in batches with asyncio.gather over one shared keep-alive client
     - Keep each task small and focused; avoid business orchestration here
-  - schedulers/
-    - Periodic jobs via APScheduler or Celery Beat (e.g., nightly cleanups, retry sweeps)
-  - consumers/
-    - Event/stream consumers (e.g., Kafka/SQS handlers) with clear offsets/ack logic
   - utils.py
-    - Shared helpers for retries, backoff, idempotency keys, serialization, etc.
+    - `retry_delay` / `sleep_backoff` (full-jitter backoff) and `RedisPools`, the
+      per-workload Redis pools also used by the API cache (src/core/cache.py)
+  - schedulers/ (not yet created)
+    - Periodic jobs via APScheduler or Celery Beat (e.g., nightly cleanups, retry sweeps)
   - __init__.py (this file)
-    - No runtime side effects; organizational guidance only
+    - No imports or runtime side effects; import the submodules directly
 
 Choosing a background processing framework (options):
 - Redis-backed:
@@ -44,6 +46,8 @@ Operational guidelines:
   - Prevent double processing (locks/dedup keys) when retries occur
 - Retries & backoff:
   - Use exponential backoff with jitter; define a maximum retry policy
+  - Task handlers must use `workers.utils.retry_delay` / `sleep_backoff` (full jitter)
+    instead of fixed sleeps so retries do not fire in synchronized waves
   - Route poison messages to a dead-letter queue (DLQ) for inspection
 - Observability:
   - Structured logging with contextual fields (job_id, correlation_id, user_id, ride_id)
@@ -54,6 +58,9 @@ Operational guidelines:
   - Keep secrets out of the repo (use vaults or environment-injected secrets)
 - Resource usage:
   - Bound concurrency to avoid overwhelming downstream services
+  - Use the per-workload Redis pools in `workers.utils`: BLPOP/XREAD consumers must use
+    `get_queue_client()`, subscriptions `get_pubsub_client()`, and short GET/SET calls
+    `get_cache_client()`, so blocked consumers cannot starve cache lookups
   - Prefer graceful shutdown (drain queues, ack offsets, close clients)
 - Testing:
   - Unit-test task functions independently (pure functions where possible)
@@ -65,8 +72,7 @@ Security considerations:
 - Validate inputs from queues/streams; treat them as untrusted
 - Use least-privilege credentials for brokers and external services
 
-This file intentionally contains no executable code or imports. Create concrete
-modules as the product demands and keep worker logic decoupled from HTTP routes.
+Keep worker logic decoupled from HTTP routes.
 """
 
 # This package intentionally exports nothing by default.
@@ -0,0 +1,7 @@
+"""
+Event/stream consumers for Taxini workers.
+"""
+
+from src.workers.consumers.base import BatchConsumer
+
+__all__ = ["BatchConsumer"]
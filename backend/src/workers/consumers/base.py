@@ -0,0 +1,184 @@
+"""
+Batching consumer loop shared by stream consumers.
+
+Records are pulled until either `max_batch` records are buffered or `max_wait_ms`
+has elapsed, then handed to the handler as one list and committed once. Per-record
+handling and per-record offset commits dominate consumer cost otherwise; batching
+amortizes them while `max_wait_ms` bounds the latency added to any single record.
+
+For the notification consumer, batches in the 10-20k range are reasonable before
+network bandwidth, not per-message overhead, becomes the limit.
+
+The wrapped client only needs `poll(timeout)` returning one record or None, and
+`commit(asynchronous=False)` (the confluent-kafka Consumer interface).
+
+With `decouple_fetch=True` a dedicated fetcher thread polls batches into a bounded
+single-producer/single-consumer buffer of `prefetch_depth` batches, so batch K+1 is
+fetched while the handler works on batch K. Because the client's position then runs
+ahead of what has been handled, offsets are committed per partition from the
+handled records (`commit(message=...)`) instead of from the client's position.
+"""
+
+import logging
+import threading
+from collections import deque
+from time import monotonic
+from typing import Any, Callable, Deque, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class BatchConsumer:
+    """Accumulate records into batches and commit once per handled batch."""
+
+    def __init__(
+        self,
+        consumer: Any,
+        handler: Callable[[List[Any]], None],
+        max_batch: int = 500,
+        max_wait_ms: int = 100,
+        enable_auto_commit: bool = False,
+        decouple_fetch: bool = False,
+        prefetch_depth: int = 2,
+    ):
+        self.consumer = consumer
+        self.handler = handler
+        self.max_batch = max_batch
+        self.max_wait_ms = max_wait_ms
+        self.enable_auto_commit = enable_auto_commit
+        self.decouple_fetch = decouple_fetch
+        self.prefetch_depth = prefetch_depth
+
+        # SPSC hand-off between the fetcher thread and the handler; deque append/popleft
+        # are atomic, the events only provide wake-ups and backpressure
+        self._batches: Deque[List[Any]] = deque()
+        self._has_batch = threading.Event()
+        self._has_space = threading.Event()
+        self._has_space.set()
+        self._stop_fetch = threading.Event()
+        self._fetcher: Optional[threading.Thread] = None
+        self._fetch_error: Optional[BaseException] = None
+
+    def poll_batch(self) -> List[Any]:
+        """Poll until the batch is full or the wait deadline passes."""
+        msgs: List[Any] = []
+        deadline = monotonic() + self.max_wait_ms / 1000
+        while len(msgs) < self.max_batch:
+            remaining = deadline - monotonic()
+            if remaining <= 0:
+                break
+            msg = self.consumer.poll(timeout=remaining)
+            if msg is not None:
+                msgs.append(msg)
+        return msgs
+
+    def process_batch(self, msgs: List[Any]) -> int:
+        """Hand a batch to the handler and commit its offsets once."""
+        if not msgs:
+            return 0
+        self.handler(msgs)
+        if not self.enable_auto_commit:
+            if self.decouple_fetch:
+                self._commit_handled(msgs)
+            else:
+                self.consumer.commit(asynchronous=False)
+        return len(msgs)
+
+    def _commit_handled(self, msgs: List[Any]) -> None:
+        """Commit the last handled record of each partition in the batch."""
+        last_by_partition = {}
+        for msg in msgs:
+            last_by_partition[(msg.topic(), msg.partition())] = msg
+        for msg in last_by_partition.values():
+            self.consumer.commit(message=msg, asynchronous=False)
+
+    def start_fetcher(self) -> None:
+        """Start the background fetcher thread (decoupled mode only)."""
+        if self._fetcher is not None:
+            return
+        self._stop_fetch.clear()
+        self._fetch_error = None
+        self._fetcher = threading.Thread(target=self._fetch_loop, name="batch-fetcher", daemon=True)
+        self._fetcher.start()
+
+    def stop_fetcher(self, timeout: float = 5.0) -> None:
+        """Stop the fetcher thread; already-fetched batches stay buffered."""
+        if self._fetcher is None:
+            return
+        self._stop_fetch.set()
+        self._has_space.set()
+        self._fetcher.join(timeout=timeout)
+        self._fetcher = None
+
+    def _fetch_loop(self) -> None:
+        try:
+            while not self._stop_fetch.is_set():
+                if len(self._batches) >= self.prefetch_depth:
+                    self._has_space.clear()
+                    # Re-check after clearing so a concurrent take is not missed
+                    if len(self._batches) >= self.prefetch_depth:
+                        self._has_space.wait(timeout=self.max_wait_ms / 1000)
+                    continue
+                msgs = self.poll_batch()
+                if msgs:
+                    self._batches.append(msgs)
+                    self._has_batch.set()
+        except Exception as e:
+            # Hand the failure to the handler thread; a dead fetcher would otherwise look idle
+            logger.error(f"Batch fetcher stopped: {e}")
+            self._fetch_error = e
+            self._has_batch.set()
+
+    def _raise_fetch_error(self) -> None:
+        """Re-raise a fetcher failure in the calling (handler) thread."""
+        if self._fetch_error is not None:
+            raise self._fetch_error
+
+    def take_batch(self, timeout: Optional[float] = None) -> List[Any]:
+        """
+        Take the next prefetched batch, waiting up to `timeout` seconds for one.
+
+        Batches fetched before a fetcher failure are handed out first; after that
+        the failure is re-raised here.
+        """
+        if not self._batches:
+            self._raise_fetch_error()
+            self._has_batch.clear()
+            if not self._batches and not self._has_batch.wait(timeout=timeout):
+                return []
+            if not self._batches:
+                self._raise_fetch_error()
+                return []
+        msgs = self._batches.popleft()
+        self._has_space.set()
+        return msgs
+
+    def run_once(self) -> int:
+        """Poll, handle and commit a single batch; returns the number of records."""
+        if self.decouple_fetch:
+            return self.process_batch(self.take_batch(timeout=self.max_wait_ms / 1000))
+        return self.process_batch(self.poll_batch())
+
+    def drain(self, timeout: float) -> int:
+        """
+        Handle batches already prefetched, stopping at `timeout` seconds.
+
+        Returns:
+            Number of batches left unhandled (their offsets are not committed)
+        """
+        self.stop_fetcher()
+        deadline = monotonic() + timeout
+        while self._batches and monotonic() < deadline:
+            self.process_batch(self._batches.popleft())
+        return len(self._batches)
+
+    def run(self, should_stop: Callable[[], bool]) -> None:
+        """Consume batches until `should_stop()` returns True (checked between batches)."""
+        if self.decouple_fetch:
+            self.start_fetcher()
+        try:
+            while not should_stop():
+                self.run_once()
+        finally:
+            if self.decouple_fetch:
+                self.stop_fetcher()
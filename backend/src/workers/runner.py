@@ -0,0 +1,141 @@
+"""
+Celery worker entrypoint.
+
+Run with `python -m src.workers.runner`. The worker is started with `-Ofair` and a
+prefetch multiplier of 1 so a slow task (payment capture, geo clustering) never
+sits in front of reserved fast ones (push notifications) on the same process.
+Gossip, mingle and heartbeat are disabled to cut cross-worker broker chatter.
+
+Requires the `workers` extra (`celery[redis]`).
+
+Stream consumers that run outside Celery use `run_consumer`, which drains on
+SIGTERM/SIGINT: it stops taking new batches, finishes prefetched ones within
+`DRAIN_TIMEOUT_SECONDS`, commits, and then closes the broker, Redis and HTTP clients.
+"""
+
+import asyncio
+import logging
+import os
+import signal
+import threading
+from contextlib import ExitStack
+from time import monotonic
+from typing import Optional
+from src.core.settings import settings
+from src.workers.consumers.base import BatchConsumer
+from src.workers.tasks.notifications import close_http_client
+from src.workers.utils import RedisPools
+
+logger = logging.getLogger(__name__)
+
+try:
+    from celery import Celery
+    CELERY_AVAILABLE = True
+except ImportError:
+    CELERY_AVAILABLE = False
+
+DRAIN_TIMEOUT_SECONDS = 30
+
+celery_app = None
+_draining = threading.Event()
+
+if CELERY_AVAILABLE:
+    celery_app = Celery(
+        "taxini",
+        broker=settings.worker_broker_url or settings.redis_url,
+    )
+    celery_app.conf.update(
+        task_acks_late=True,
+        worker_prefetch_multiplier=settings.worker_prefetch,
+        worker_disable_rate_limits=True,
+    )
+
+
+def build_worker_argv() -> list[str]:
+    """Build the `celery worker` command line for this deployment."""
+    return [
+        "celery",
+        "-A", "src.workers.runner:celery_app",
+        "worker",
+        "-Ofair",
+        "--concurrency", str(settings.worker_concurrency),
+        "--prefetch-multiplier", str(settings.worker_prefetch),
+        "--without-heartbeat",
+        "--without-gossip",
+        "--without-mingle",
+    ]
+
+
+def _request_drain(signum, frame) -> None:
+    """Signal handler: stop consuming after the current batch."""
+    logger.info(f"Received signal {signum}, draining")
+    _draining.set()
+
+
+def install_signal_handlers() -> None:
+    """Route SIGTERM and SIGINT to a graceful drain instead of a hard exit."""
+    signal.signal(signal.SIGTERM, _request_drain)
+    signal.signal(signal.SIGINT, _request_drain)
+
+
+def run_consumer(
+    batch_consumer: BatchConsumer,
+    drain_timeout: float = DRAIN_TIMEOUT_SECONDS,
+    loop: Optional[asyncio.AbstractEventLoop] = None,
+) -> None:
+    """
+    Run a batch consumer until signalled, then drain and close clients in order.
+
+    Cleanup runs even when the handler or the drain raises. The shared HTTP client
+    is bound to the event loop its requests ran on, so it is closed on that loop:
+    pass the loop the handler drives its coroutines with, or leave `loop` unset to
+    have one created and installed as this thread's current loop for the run.
+    """
+    owns_loop = loop is None
+    if owns_loop:
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+
+    install_signal_handlers()
+    with ExitStack() as cleanup:
+        # Callbacks run last-registered first: consumer, Redis, HTTP client, loop
+        if owns_loop:
+            cleanup.callback(_close_loop, loop)
+        cleanup.callback(lambda: loop.run_until_complete(close_http_client()))
+        cleanup.callback(lambda: loop.run_until_complete(RedisPools.disconnect_async()))
+        cleanup.callback(RedisPools.disconnect_all)
+        cleanup.callback(batch_consumer.consumer.close)
+
+        try:
+            batch_consumer.run(should_stop=_draining.is_set)
+        finally:
+            started = monotonic()
+            in_flight = batch_consumer.drain(timeout=drain_timeout)
+
+    logger.info({
+        "event": "drain_complete",
+        "in_flight": in_flight,
+        "duration_ms": int((monotonic() - started) * 1000),
+    })
+
+
+def _close_loop(loop: asyncio.AbstractEventLoop) -> None:
+    """Close a loop created by run_consumer and detach it from the thread."""
+    asyncio.set_event_loop(None)
+    loop.close()
+
+
+def main() -> None:
+    """Replace the current process with a Celery worker."""
+    if not CELERY_AVAILABLE:
+        raise RuntimeError("Celery is not installed; install the `workers` extra")
+    if not (settings.worker_broker_url or settings.redis_url):
+        raise RuntimeError("Set TAXINI_WORKER_BROKER_URL or TAXINI_REDIS_URL to start workers")
+
+    argv = build_worker_argv()
+    logger.info(f"Starting worker: {' '.join(argv)}")
+    os.execvp(argv[0], argv)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,3 @@
+"""
+Domain-specific worker tasks.
+"""
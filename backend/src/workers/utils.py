@@ -0,0 +1,153 @@
+"""
+Shared helpers for worker task handlers.
+
+Retries must use `retry_delay` / `sleep_backoff` rather than fixed sleeps so that
+failed jobs spread their retries out instead of hammering a recovering service
+in lockstep.
+
+Redis connections are split into per-workload pools (`RedisPools`): blocking
+queue reads (BLPOP/XREAD) use the queue pool, pub/sub subscriptions use the
+pubsub pool, and short GET/SET calls use the cache pool, so a blocked consumer
+can never exhaust the connections that cache lookups need. The API's cache helpers
+(src/core/cache.py) take their clients from the same cache pools.
+"""
+
+import asyncio
+import random
+from typing import Optional
+from src.core.settings import settings
+
+try:
+    import redis
+    import redis.asyncio as aioredis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+
+def retry_delay(attempt: int, base: float = 0.1, cap: float = 30.0) -> float:
+    """
+    Compute a retry delay using exponential backoff with full jitter.
+
+    Args:
+        attempt: Zero-based retry attempt number
+        base: Delay in seconds for the first attempt
+        cap: Maximum delay in seconds
+
+    Returns:
+        A delay drawn uniformly from [0, min(cap, base * 2 ** attempt)]
+    """
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+async def sleep_backoff(attempt: int, base: float = 0.1, cap: float = 30.0) -> None:
+    """Sleep for a full-jitter backoff delay before retrying `attempt`."""
+    await asyncio.sleep(retry_delay(attempt, base=base, cap=cap))
+
+
+class RedisPools:
+    """Lazily created Redis connection pools, one per workload."""
+
+    CACHE_MAX_CONNECTIONS = 20
+    CACHE_SOCKET_TIMEOUT = 1.0  # Fail fast; cache misses fall back to the database
+    QUEUE_MAX_CONNECTIONS = 10  # Blocking reads hold a connection for their whole timeout
+    PUBSUB_MAX_CONNECTIONS = 5
+
+    _cache = None
+    _async_cache = None
+    _queue = None
+    _pubsub = None
+
+    @classmethod
+    def cache(cls):
+        """Pool for short GET/SET operations."""
+        if cls._cache is None:
+            cls._cache = redis.ConnectionPool.from_url(
+                settings.redis_url,
+                max_connections=cls.CACHE_MAX_CONNECTIONS,
+                socket_timeout=cls.CACHE_SOCKET_TIMEOUT,
+                decode_responses=True,
+            )
+        return cls._cache
+
+    @classmethod
+    def async_cache(cls):
+        """Asyncio pool for short GET/SET operations, with the cache pool's limits."""
+        if cls._async_cache is None:
+            cls._async_cache = aioredis.ConnectionPool.from_url(
+                settings.redis_url,
+                max_connections=cls.CACHE_MAX_CONNECTIONS,
+                socket_timeout=cls.CACHE_SOCKET_TIMEOUT,
+                decode_responses=True,
+            )
+        return cls._async_cache
+
+    @classmethod
+    def queue(cls):
+        """Pool for blocking queue/stream consumers (no socket timeout)."""
+        if cls._queue is None:
+            cls._queue = redis.ConnectionPool.from_url(
+                settings.redis_url,
+                max_connections=cls.QUEUE_MAX_CONNECTIONS,
+                socket_timeout=None,
+                decode_responses=True,
+            )
+        return cls._queue
+
+    @classmethod
+    def pubsub(cls):
+        """Pool for long-lived pub/sub subscriptions."""
+        if cls._pubsub is None:
+            cls._pubsub = redis.ConnectionPool.from_url(
+                settings.redis_url,
+                max_connections=cls.PUBSUB_MAX_CONNECTIONS,
+                decode_responses=True,
+            )
+        return cls._pubsub
+
+    @classmethod
+    def disconnect_all(cls) -> None:
+        """Close every blocking pool that has been created (see `disconnect_async`)."""
+        for pool in (cls._cache, cls._queue, cls._pubsub):
+            if pool is not None:
+                pool.disconnect()
+        cls._cache = cls._queue = cls._pubsub = None
+
+    @classmethod
+    async def disconnect_async(cls) -> None:
+        """Close the asyncio cache pool on the event loop that used it."""
+        if cls._async_cache is not None:
+            await cls._async_cache.disconnect()
+        cls._async_cache = None
+
+
+def _redis_enabled() -> bool:
+    return REDIS_AVAILABLE and bool(settings.redis_url)
+
+
+def get_cache_client() -> Optional["redis.Redis"]:
+    """Get a client on the cache pool, or None when Redis is not configured."""
+    if not _redis_enabled():
+        return None
+    return redis.Redis(connection_pool=RedisPools.cache())
+
+
+def get_async_cache_client() -> Optional["aioredis.Redis"]:
+    """Get an asyncio client on the cache pool, or None when Redis is not configured."""
+    if not _redis_enabled():
+        return None
+    return aioredis.Redis(connection_pool=RedisPools.async_cache())
+
+
+def get_queue_client() -> Optional["redis.Redis"]:
+    """Get a client on the queue pool for BLPOP/XREAD consumers."""
+    if not _redis_enabled():
+        return None
+    return redis.Redis(connection_pool=RedisPools.queue())
+
+
+def get_pubsub_client() -> Optional["redis.Redis"]:
+    """Get a client on the pub/sub pool."""
+    if not _redis_enabled():
+        return None
+    return redis.Redis(connection_pool=RedisPools.pubsub())
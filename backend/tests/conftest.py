@@ -3,112 +3,388 @@ Test configuration and fixtures.
 """
 
 import pytest
+from contextlib import contextmanager
 from fastapi.testclient import TestClient
-from sqlmodel import Session, create_engine
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event
+from sqlalchemy.orm import raiseload
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import Session, SQLModel, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlmodel.pool import StaticPool
-from unittest.mock import Mock, patch
-import tempfile
+from unittest.mock import DEFAULT, Mock, patch
+import io
 import os
+import sqlite3
+from types import SimpleNamespace
+from typing import Optional
 
 # Import the app and dependencies
 from src.app import app
-from src.db.session import get_session
+from src.db.session import get_async_db, get_session
 from src.services.supabase_client import supabase
+from src.services.admin_auth import AdminAuthService
+from tests.helpers import TEST_API_KEY, FakeAsyncRedis, FakeRedis
 
+# Import models so their tables are registered on SQLModel.metadata
+from src.models.user import User, Driver, Rider, Admin
 
-# Create test database engine
-@pytest.fixture(name="session")
-def session_fixture():
-    """Create a test database session."""
+SAMPLE_PNG_BYTES = b'\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR\x00\x00\x00\x01\x00\x00\x00\x01\x08\x02\x00\x00\x00\x90wS\xde\x00\x00\x00\tpHYs\x00\x00\x0b\x13\x00\x00\x0b\x13\x01\x00\x9a\x9c\x18\x00\x00\x00\nIDATx\x9cc\x00\x01\x00\x00\x05\x00\x01\x0f\x01P\x01\x00\x00\x00\x00IEND\xaeB`\x82'
+
+# Canned Supabase auth responses, built once and shared by every mock_supabase use.
+# Plain dicts (not MappingProxyType) because AuthService branches on isinstance(..., dict);
+# tests replace return_value rather than mutating these.
+_TEST_USER = {
+    "id": "test_user_id",
+    "phone": "+1234567890",
+    "email": "test@example.com",
+    "email_confirmed_at": "2024-01-01T00:00:00Z",
+    "phone_confirmed_at": "2024-01-01T00:00:00Z"
+}
+
+SIGN_IN_WITH_OTP_RESPONSE = {
+    "data": {"session": None, "user": None},
+    "error": None
+}
+
+VERIFY_OTP_RESPONSE = {
+    "data": {
+        "session": {
+            "access_token": "test_access_token",
+            "refresh_token": "test_refresh_token",
+            "expires_in": 3600
+        },
+        "user": _TEST_USER
+    },
+    "error": None
+}
+
+GET_USER_RESPONSE = {
+    "data": {"user": _TEST_USER},
+    "error": None
+}
+
+REFRESH_SESSION_RESPONSE = {
+    "data": {
+        "session": {
+            "access_token": "new_test_access_token",
+            "refresh_token": "new_test_refresh_token",
+            "expires_in": 3600
+        }
+    },
+    "error": None
+}
+
+
+def pytest_configure(config):
+    """Set process-wide test environment once per (xdist worker) process."""
+    # Set test API key in environment (use the same key from .env)
+    os.environ["TAXINI_API_KEY"] = TEST_API_KEY
+
+
+@pytest.fixture(name="engine", scope="session")
+def engine_fixture():
+    """Create the test database engine and schema once per test run."""
     engine = create_engine(
         "sqlite:///:memory:",
         connect_args={"check_same_thread": False},
         poolclass=StaticPool,
     )
-    
-    # Import models to create tables
-    from src.models.user import User, Driver, Rider, Admin
-    from sqlmodel import SQLModel
-    
+
+    # pysqlite manages transactions itself and breaks SAVEPOINT handling;
+    # hand BEGIN back to SQLAlchemy so nested transactions roll back cleanly.
+    @event.listens_for(engine, "connect")
+    def do_connect(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+        # Test data is disposable: never wait on fsync or write journals/temp tables to disk
+        dbapi_connection.execute("PRAGMA synchronous=OFF")
+        dbapi_connection.execute("PRAGMA journal_mode=MEMORY")
+        dbapi_connection.execute("PRAGMA temp_store=MEMORY")
+
+    @event.listens_for(engine, "begin")
+    def do_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
     SQLModel.metadata.create_all(engine)
-    
-    with Session(engine) as session:
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture(scope="session")
+def schema_template():
+    """Build an empty-schema template SQLite database once per test run."""
+    # Kept off the shared engine: backup() cannot read a connection mid-transaction
+    template = sqlite3.connect(":memory:", check_same_thread=False)
+    template_engine = create_engine("sqlite://", creator=lambda: template, poolclass=StaticPool)
+    SQLModel.metadata.create_all(template_engine)
+    yield template
+    template_engine.dispose()
+
+
+@pytest.fixture
+def empty_session(schema_template):
+    """
+    Create a session on a private, empty clone of the schema.
+
+    For tests that need a guaranteed-empty database regardless of data seeded on the
+    shared connection; cloning with sqlite3 backup() skips re-running the DDL.
+    """
+    clone = sqlite3.connect(":memory:", check_same_thread=False)
+    schema_template.backup(clone)
+    clone_engine = create_engine("sqlite://", creator=lambda: clone, poolclass=StaticPool)
+
+    with Session(clone_engine) as session:
+        yield session
+
+    clone_engine.dispose()
+
+
+@pytest.fixture(name="connection", scope="session")
+def connection_fixture(engine):
+    """Open one connection with an outer transaction that is discarded after the run."""
+    connection = engine.connect()
+    transaction = connection.begin()
+    yield connection
+    transaction.rollback()
+    connection.close()
+
+
+@pytest.fixture(scope="session")
+def seed_session(connection):
+    """
+    Provide a context manager for seeding data shared by several tests.
+
+    Class-scoped sample-data fixtures seed inside `with seed_session() as session:`
+    and yield from within the block. The rows live in a SAVEPOINT on the shared
+    connection, so each test sees them (its own changes are rolled back by the
+    `session` fixture) and they are rolled back when the fixture is torn down.
+    """
+    @contextmanager
+    def _seed_session():
+        savepoint = connection.begin_nested()
+        try:
+            with Session(
+                bind=connection,
+                join_transaction_mode="create_savepoint",
+                expire_on_commit=False,
+            ) as session:
+                yield session
+        finally:
+            if savepoint.is_active:
+                savepoint.rollback()
+
+    return _seed_session
+
+
+@pytest.fixture(scope="module")
+def admin_token(seed_session):
+    """
+    Create one admin user for the module and return its signed JWT.
+
+    Module scope rather than session scope: other modules create their own
+    admin@taxini.com user, which would collide with a run-wide row.
+    """
+    with seed_session() as session:
+        admin_user = User(
+            auth_id="admin-shared",
+            name="Test Admin",
+            email="admin@taxini.com",
+            phone_number="+12345678900",
+            role="admin",
+            auth_status="verified"
+        )
+        session.add(admin_user)
+        session.flush()
+        session.add(Admin(user_id=admin_user.id, test_column="admin_data"))
+        session.commit()
+
+        yield AdminAuthService().create_admin_token(admin_user.id, admin_user.email)
+
+
+@pytest.fixture(name="session")
+def session_fixture(connection):
+    """Create a test database session rolled back after each test."""
+    savepoint = connection.begin_nested()
+
+    # Commits inside the test only release an inner SAVEPOINT; this one is rolled back
+    with Session(bind=connection, join_transaction_mode="create_savepoint") as session:
         yield session
 
+    if savepoint.is_active:
+        savepoint.rollback()
+
+
+@pytest.fixture
+def strict_session(session: Session):
+    """
+    The test session with lazy loading disabled.
+
+    Every ORM SELECT gets `raiseload("*", sql_only=True)`, so touching a relationship
+    the code under test did not eager-load raises instead of silently issuing a query.
+    """
+    def add_raiseload(orm_execute_state):
+        if orm_execute_state.is_select and not orm_execute_state.is_relationship_load:
+            orm_execute_state.statement = orm_execute_state.statement.options(
+                raiseload("*", sql_only=True)
+            )
+
+    event.listen(session, "do_orm_execute", add_raiseload)
+    yield session
+    event.remove(session, "do_orm_execute", add_raiseload)
+
+
+@pytest.fixture
+def query_count(engine):
+    """
+    Count SQL statements executed on the test engine during a test.
+
+    Reset `query_count.value` to 0 right before the call under test, then assert on it
+    to catch N+1 lazy loads.
+    """
+    counter = SimpleNamespace(value=0)
+
+    def count_query(conn, cursor, statement, parameters, context, executemany):
+        # SAVEPOINT bookkeeping from the test session is not part of the code under test
+        if not statement.lstrip().upper().startswith(("SAVEPOINT", "RELEASE", "ROLLBACK")):
+            counter.value += 1
+
+    event.listen(engine, "before_cursor_execute", count_query)
+    yield counter
+    event.remove(engine, "before_cursor_execute", count_query)
+
+
+@pytest.fixture(scope="session")
+def _client_singleton():
+    """Create the TestClient (and run app lifespan) once per test run."""
+    with TestClient(app) as client:
+        yield client
+
 
 @pytest.fixture(name="client")
-def client_fixture(session: Session):
-    """Create a test client with dependency overrides."""
+def client_fixture(session: Session, _client_singleton: TestClient):
+    """Provide the shared test client with per-test dependency overrides."""
     def get_session_override():
         return session
 
     app.dependency_overrides[get_session] = get_session_override
     
-    # Set test API key in environment (use the same key from .env)
-    os.environ["TAXINI_API_KEY"] = "Tw_82EVzdQY9pWSaNbN29MyxFCDESSRlcndy9SHwQnw"
-    
-    client = TestClient(app)
-    yield client
+    yield _client_singleton
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture(name="async_client")
+async def async_client_fixture(session: Session, _client_singleton: TestClient):
+    """
+    Async client calling the app in-process, with the same per-test session override as `client`.
+
+    Requests go straight through ASGITransport instead of TestClient's portal thread.
+    Depends on `_client_singleton` so the app lifespan has already run.
+    """
+    def get_session_override():
+        return session
+
+    app.dependency_overrides[get_session] = get_session_override
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://testserver") as client:
+        yield client
     app.dependency_overrides.clear()
 
 
+@pytest.fixture
+async def async_db_session():
+    """
+    AsyncSession on a fresh in-memory aiosqlite database, also served as `get_async_db`.
+
+    For the `*_async` services and the endpoints that depend on get_async_db; pair it
+    with `async_client` so requests run on the same event loop as the session.
+    """
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        async def get_async_db_override():
+            yield session
+
+        app.dependency_overrides[get_async_db] = get_async_db_override
+        yield session
+        app.dependency_overrides.pop(get_async_db, None)
+
+    await engine.dispose()
+
+
+@pytest.fixture
+def asgi_status(client: TestClient):
+    """
+    Call the app's ASGI interface directly and return only the response status.
+
+    For negative-path tests that assert on the status code alone; skips building an
+    httpx request and reading the body. Depends on `client` for the session override.
+    """
+    async def _asgi_status(method: str, path: str, headers: Optional[dict] = None, body: bytes = b"") -> int:
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": method,
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": b"",
+            "root_path": "",
+            "headers": [
+                (key.lower().encode("latin-1"), value.encode("latin-1"))
+                for key, value in (headers or {}).items()
+            ],
+            "client": ("testclient", 50000),
+            "server": ("testserver", 80),
+        }
+        messages = [{"type": "http.request", "body": body, "more_body": False}]
+        status = None
+
+        async def receive():
+            return messages.pop() if messages else {"type": "http.disconnect"}
+
+        async def send(message):
+            nonlocal status
+            if message["type"] == "http.response.start" and status is None:
+                status = message["status"]
+
+        await app(scope, receive, send)
+        return status
+
+    return _asgi_status
+
+
+@pytest.fixture
+def authed_client(async_client: AsyncClient, admin_token: str):
+    """`async_client` with the module admin's bearer token and the API key preset on every request."""
+    async_client.headers.update({
+        "Authorization": f"Bearer {admin_token}",
+        "X-API-Key": TEST_API_KEY,
+    })
+    return async_client
+
+
 @pytest.fixture
 def mock_supabase():
     """Mock Supabase client for testing with updated response format."""
-    with patch('src.services.supabase_client.supabase') as mock_client, \
-         patch('src.services.supabase_client.ensure_supabase_client') as mock_ensure:
-        
+    with patch.multiple(
+        'src.services.supabase_client',
+        supabase=DEFAULT,
+        ensure_supabase_client=DEFAULT,
+    ) as mocks:
+        mock_client = mocks["supabase"]
+
         # Make ensure_supabase_client return our mock
-        mock_ensure.return_value = mock_client
-        
+        mocks["ensure_supabase_client"].return_value = mock_client
+
         # Mock auth responses in dict format (current supabase-py style)
-        mock_client.auth.sign_in_with_otp.return_value = {
-            "data": {"session": None, "user": None},
-            "error": None
-        }
-        
-        mock_client.auth.verify_otp.return_value = {
-            "data": {
-                "session": {
-                    "access_token": "test_access_token",
-                    "refresh_token": "test_refresh_token",
-                    "expires_in": 3600
-                },
-                "user": {
-                    "id": "test_user_id",
-                    "phone": "+1234567890",
-                    "email": "test@example.com",
-                    "email_confirmed_at": "2024-01-01T00:00:00Z",
-                    "phone_confirmed_at": "2024-01-01T00:00:00Z"
-                }
-            },
-            "error": None
-        }
-        
-        mock_client.auth.get_user.return_value = {
-            "data": {
-                "user": {
-                    "id": "test_user_id",
-                    "phone": "+1234567890",
-                    "email": "test@example.com",
-                    "email_confirmed_at": "2024-01-01T00:00:00Z",
-                    "phone_confirmed_at": "2024-01-01T00:00:00Z"
-                }
-            },
-            "error": None
-        }
-        
-        mock_client.auth.refresh_session.return_value = {
-            "data": {
-                "session": {
-                    "access_token": "new_test_access_token",
-                    "refresh_token": "new_test_refresh_token",
-                    "expires_in": 3600
-                }
-            },
-            "error": None
-        }
-        
+        mock_client.auth.sign_in_with_otp.return_value = SIGN_IN_WITH_OTP_RESPONSE
+        mock_client.auth.verify_otp.return_value = VERIFY_OTP_RESPONSE
+        mock_client.auth.get_user.return_value = GET_USER_RESPONSE
+        mock_client.auth.refresh_session.return_value = REFRESH_SESSION_RESPONSE
+
         # Mock storage responses
         mock_storage = Mock()
         mock_bucket = Mock()
@@ -116,23 +392,24 @@ def mock_supabase():
         mock_bucket.get_public_url.return_value = "https://example.com/test-file.jpg"
         mock_storage.from_.return_value = mock_bucket
         mock_client.storage = mock_storage
-        
+
         yield mock_client
 
 
+@pytest.fixture
+def supabase_auth_error(mock_supabase):
+    """Return a setter that makes one mocked Supabase auth method answer with an error."""
+    def _set_error(method: str, message: str):
+        getattr(mock_supabase.auth, method).return_value = {"data": None, "error": {"message": message}}
+
+    return _set_error
+
+
 @pytest.fixture
 def sample_image_file():
-    """Create a sample image file for testing uploads."""
-    # Create a small test image file
-    content = b'\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR\x00\x00\x00\x01\x00\x00\x00\x01\x08\x02\x00\x00\x00\x90wS\xde\x00\x00\x00\tpHYs\x00\x00\x0b\x13\x00\x00\x0b\x13\x01\x00\x9a\x9c\x18\x00\x00\x00\nIDATx\x9cc\x00\x01\x00\x00\x05\x00\x01\x0f\x01P\x01\x00\x00\x00\x00IEND\xaeB`\x82'
-    
-    with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as tmp:
-        tmp.write(content)
-        tmp.flush()
-        yield tmp.name
-    
-    # Cleanup
-    os.unlink(tmp.name)
+    """Provide a sample in-memory image for testing uploads (pass as files={"file": ...})."""
+    # A 1x1 PNG; served from memory so no tempfile is written per test
+    return ("test.png", io.BytesIO(SAMPLE_PNG_BYTES), "image/png")
 
 
 @pytest.fixture
@@ -140,7 +417,7 @@ def valid_auth_headers(mock_supabase):
     """Provide valid authorization headers for testing."""
     return {
         "Authorization": "Bearer test_access_token",
-        "X-API-Key": "Tw_82EVzdQY9pWSaNbN29MyxFCDESSRlcndy9SHwQnw"
+        "X-API-Key": TEST_API_KEY
     }
 
 
@@ -165,3 +442,12 @@ def rider_profile_data():
         "role": "rider",
         "residence_place": "Downtown"
     }
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    """Enable the Redis cache helpers against one in-memory store; yields the store dict."""
+    store = {}
+    monkeypatch.setattr("src.core.cache.get_sync_redis", lambda: FakeRedis(store))
+    monkeypatch.setattr("src.core.cache.get_async_redis", lambda: FakeAsyncRedis(store))
+    yield store
@@ -0,0 +1,54 @@
+"""
+Plain helpers shared by test modules (import these; fixtures live in conftest.py).
+"""
+
+from datetime import datetime
+from uuid import uuid4
+from sqlalchemy import insert
+from sqlmodel import Session
+
+TEST_API_KEY = "Tw_82EVzdQY9pWSaNbN29MyxFCDESSRlcndy9SHwQnw"
+
+
+def bulk_seed(session: Session, model, rows):
+    """
+    Insert seed rows for `model` with one Core INSERT, bypassing the ORM unit of work.
+
+    Fills the `id` and `created_at` defaults that UUIDMixin/TimestampMixin would
+    apply (a Core INSERT skips Python-side default factories); values in `rows` win.
+    Returns the inserted row dicts so callers can reference the generated ids.
+    Does not commit, so several tables can be seeded in one transaction.
+    """
+    now = datetime.utcnow()
+    rows = [{"id": str(uuid4()), "created_at": now, **row} for row in rows]
+    session.execute(insert(model), rows)
+    return rows
+
+
+class FakeRedis:
+    """In-memory stand-in for the blocking Redis client (get/setex/delete only)."""
+
+    def __init__(self, store: dict):
+        self.store = store
+
+    def get(self, key):
+        return self.store.get(key)
+
+    def setex(self, key, ttl, value):
+        self.store[key] = value
+
+    def delete(self, *keys):
+        return sum(self.store.pop(key, None) is not None for key in keys)
+
+
+class FakeAsyncRedis(FakeRedis):
+    """Asyncio counterpart of FakeRedis sharing the same store."""
+
+    async def get(self, key):
+        return super().get(key)
+
+    async def setex(self, key, ttl, value):
+        super().setex(key, ttl, value)
+
+    async def delete(self, *keys):
+        return super().delete(*keys)
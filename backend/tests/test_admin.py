@@ -3,65 +3,32 @@ Tests for the admin API endpoints.
 """
 
 import pytest
+from datetime import datetime
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
-from sqlmodel import Session, select, func
+from sqlmodel import Session, select
 
-from src.app import app
 from src.models.user import User, Driver, Admin
 from src.models.trip import Trip
 from src.models.settings import Settings
 from src.models.enums import UserRole
 from src.services.auth import AuthService
-from src.services.admin_auth import AdminAuthService
 from src.api.v1.admin import require_admin
+from tests.helpers import TEST_API_KEY
 
-
-@pytest.fixture
-def client():
-    """Create a test client for the app."""
-    return TestClient(app)
+API_KEY_HEADER = {"X-API-Key": TEST_API_KEY}
 
 
 @pytest.fixture
-def admin_user_and_token(session: Session):
-    """Create an admin user and return both user and token."""
-    # Create an admin user in the test database
-    admin_user = User(
-        auth_id="admin-auth-id",
-        name="Admin User",
-        email="admin@taxini.com",
-        phone_number="+1234567890",
-        role="admin",
-        auth_status="verified"
-    )
-    session.add(admin_user)
-    session.commit()
-    session.refresh(admin_user)
-    
-    # Create admin profile
-    admin_profile = Admin(
-        user_id=admin_user.id,
-        test_column="admin123"
-    )
-    session.add(admin_profile)
-    session.commit()
-    
-    # Generate admin token
-    auth_service = AdminAuthService()
-    token = auth_service.create_admin_token(admin_user.id, admin_user.email)
-    
-    return admin_user, token
+def client(_client_singleton):
+    """Reuse the run-wide test client, without the conftest session override."""
+    return _client_singleton
 
 
 @pytest.fixture
-def admin_headers(admin_user_and_token):
-    """Provide admin authentication headers."""
-    _, token = admin_user_and_token
-    return {
-        "Authorization": f"Bearer {token}",
-        "X-API-Key": "Tw_82EVzdQY9pWSaNbN29MyxFCDESSRlcndy9SHwQnw"
-    }
+def admin_headers(admin_token):
+    """Provide admin authentication headers for the module's seeded admin."""
+    return {"Authorization": f"Bearer {admin_token}", **API_KEY_HEADER}
 
 
 @pytest.fixture
@@ -77,8 +44,7 @@ def mock_admin_user(monkeypatch, test_db_session):
         auth_status="verified"
     )
     test_db_session.add(admin_user)
-    test_db_session.commit()
-    test_db_session.refresh(admin_user)
+    test_db_session.flush()  # assigns admin_user.id without a separate commit
     
     # Create admin profile
     admin_profile = Admin(
@@ -137,8 +103,7 @@ def test_require_admin_dependency_non_admin(test_db_session):
         auth_status="verified"
     )
     test_db_session.add(rider_user)
-    test_db_session.commit()
-    test_db_session.refresh(rider_user)
+    test_db_session.flush()
     
     rider_current_user = CurrentUser(
         auth_id=rider_user.auth_id,
@@ -156,9 +121,9 @@ def test_require_admin_dependency_non_admin(test_db_session):
 
 def test_get_admin_dashboard(client, mock_admin_user, test_db_session):
     """Test the admin dashboard endpoint."""
-    # Add some test users
-    for i in range(3):
-        user = User(
+    # Add some test users in one batch
+    driver_users = [
+        User(
             auth_id=f"driver-{i}",
             name=f"Driver {i}",
             email=f"driver{i}@example.com",
@@ -166,20 +131,10 @@ def test_get_admin_dashboard(client, mock_admin_user, test_db_session):
             role="driver",
             auth_status="verified"
         )
-        test_db_session.add(user)
-        test_db_session.commit()
-        test_db_session.refresh(user)
-        
-        driver = Driver(
-            user_id=user.id,
-            taxi_number=f"TAXI-{i}",
-            account_status="verified",
-            driver_status="offline"
-        )
-        test_db_session.add(driver)
-    
-    for i in range(2):
-        user = User(
+        for i in range(3)
+    ]
+    rider_users = [
+        User(
             auth_id=f"rider-{i}",
             name=f"Rider {i}",
             email=f"rider{i}@example.com",
@@ -187,8 +142,20 @@ def test_get_admin_dashboard(client, mock_admin_user, test_db_session):
             role="rider",
             auth_status="verified"
         )
-        test_db_session.add(user)
+        for i in range(2)
+    ]
+    test_db_session.add_all(driver_users + rider_users)
+    test_db_session.flush()  # assigns user ids for the driver profiles
     
+    test_db_session.add_all([
+        Driver(
+            user_id=user.id,
+            taxi_number=f"TAXI-{i}",
+            account_status="verified",
+            driver_status="offline"
+        )
+        for i, user in enumerate(driver_users)
+    ])
     test_db_session.commit()
     
     # Test dashboard endpoint
@@ -236,8 +203,7 @@ def test_update_driver_account_status(client, mock_admin_user, test_db_session):
         auth_status="verified"
     )
     test_db_session.add(driver_user)
-    test_db_session.commit()
-    test_db_session.refresh(driver_user)
+    test_db_session.flush()
     
     driver_profile = Driver(
         user_id=driver_user.id,
@@ -266,29 +232,10 @@ def test_update_driver_account_status(client, mock_admin_user, test_db_session):
 
 # New tests for the enhanced admin features
 
-def test_admin_login_endpoint(client: TestClient, session: Session):
-    """Test admin login endpoint."""
-    # Create admin user first
-    admin_user = User(
-        auth_id="login-test-admin",
-        name="Login Test Admin",
-        email="admin@taxini.com",
-        phone_number="+12345678900",
-        role="admin",
-        auth_status="verified"
-    )
-    session.add(admin_user)
-    session.commit()
-    session.refresh(admin_user)
-    
-    admin_profile = Admin(
-        user_id=admin_user.id,
-        test_column="admin_data"
-    )
-    session.add(admin_profile)
-    session.commit()
-    
-    headers = {"X-API-Key": "Tw_82EVzdQY9pWSaNbN29MyxFCDESSRlcndy9SHwQnw"}
+@pytest.mark.usefixtures("admin_token")
+def test_admin_login_endpoint(client: TestClient):
+    """Test admin login endpoint against the module's seeded admin (admin@taxini.com)."""
+    headers = {"X-API-Key": TEST_API_KEY}
     
     response = client.post(
         "/api/v1/admin/login",
@@ -375,8 +322,7 @@ def test_admin_trips_endpoint_integration(client: TestClient, admin_headers, ses
         auth_status="verified"
     )
     session.add(rider)
-    session.commit()
-    session.refresh(rider)
+    session.flush()
     
     trip = Trip(
         rider_id=rider.id,
@@ -390,11 +336,10 @@ def test_admin_trips_endpoint_integration(client: TestClient, admin_headers, ses
         trip_type="regular",
         estimated_distance_km=10.0,
         estimated_cost_tnd=20.0,
-        created_at=session.exec(select(func.now())).scalar()
+        created_at=datetime.utcnow()
     )
     session.add(trip)
     session.commit()
-    session.refresh(trip)
     
     # Test GET all trips
     response = client.get("/api/v1/admin/trips", headers=admin_headers)
@@ -429,15 +374,14 @@ def test_admin_endpoints_require_authentication(client: TestClient):
         # Test with invalid token
         headers = {
             "Authorization": "Bearer invalid_token",
-            "X-API-Key": "Tw_82EVzdQY9pWSaNbN29MyxFCDESSRlcndy9SHwQnw"
+            "X-API-Key": TEST_API_KEY
         }
         response = client.get(endpoint, headers=headers)
         assert response.status_code == 401
 
 
-def test_admin_endpoints_require_api_key(client: TestClient, admin_user_and_token):
+def test_admin_endpoints_require_api_key(client: TestClient, admin_token):
     """Test that all admin endpoints require API key."""
-    _, token = admin_user_and_token
     
     endpoints = [
         "/api/v1/admin/statistics/global",
@@ -445,7 +389,7 @@ def test_admin_endpoints_require_api_key(client: TestClient, admin_user_and_toke
         "/api/v1/admin/trips"
     ]
     
-    headers_without_api_key = {"Authorization": f"Bearer {token}"}
+    headers_without_api_key = {"Authorization": f"Bearer {admin_token}"}
     
     for endpoint in endpoints:
         response = client.get(endpoint, headers=headers_without_api_key)
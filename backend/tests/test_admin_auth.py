@@ -28,8 +28,7 @@ def admin_user(test_db_session):
         auth_status="verified"
     )
     test_db_session.add(user)
-    test_db_session.commit()
-    test_db_session.refresh(user)
+    test_db_session.flush()  # assigns user.id without a separate commit
     
     # Create admin profile with password
     admin = Admin(
@@ -2,106 +2,94 @@
 Tests for admin settings management endpoints.
 """
 
+import json
 import pytest
-from fastapi.testclient import TestClient
+from types import MappingProxyType
+from httpx import URL, AsyncClient
 from sqlmodel import Session, select
 
-from src.models.user import User, Admin
 from src.models.settings import Settings
-from src.services.admin_auth import AdminAuthService
+from src.app import app
+from src.db.session import get_session
+from tests.helpers import TEST_API_KEY, bulk_seed
+
+# Fixed endpoints, parsed once; per-key paths are built from SETTINGS_URL
+SETTINGS_URL = URL("/api/v1/admin/settings")
+APPROACH_FEE_URL = URL("/api/v1/admin/settings/approach_fee_rate_per_km")
+
+# Seed and expected-shape data shared by every test; read-only so no test can mutate it
+_SAMPLE_SETTINGS = (
+    MappingProxyType({
+        "setting_key": "approach_fee_rate_per_km",
+        "setting_value": "0.5",
+        "data_type": "float",
+        "description": "Fee rate per kilometer for driver approach to pickup location (TND/km)",
+        "category": "pricing",
+        "is_active": True,
+        "is_editable": True
+    }),
+    MappingProxyType({
+        "setting_key": "base_fare",
+        "setting_value": "2.0",
+        "data_type": "float",
+        "description": "Base fare for all trips (TND)",
+        "category": "pricing",
+        "is_active": True,
+        "is_editable": True
+    }),
+    MappingProxyType({
+        "setting_key": "commission_rate",
+        "setting_value": "0.15",
+        "data_type": "float",
+        "description": "Platform commission rate (decimal, e.g., 0.15 = 15%)",
+        "category": "pricing",
+        "is_active": True,
+        "is_editable": True
+    }),
+    MappingProxyType({
+        "setting_key": "system_version",
+        "setting_value": "1.0.0",
+        "data_type": "string",
+        "description": "Current system version",
+        "category": "system",
+        "is_active": True,
+        "is_editable": False  # Read-only setting
+    })
+)
+
+_REQUIRED_SETTING_FIELDS = (
+    "id", "setting_key", "setting_value", "data_type",
+    "description", "category", "is_active", "is_editable"
+)
 
 
 class TestAdminSettings:
     """Test class for admin settings management functionality."""
 
-    @pytest.fixture
-    def admin_token(self, session: Session):
-        """Create admin user and get authentication token."""
-        # Create admin user
-        admin_user = User(
-            auth_id="admin-settings-test",
-            name="Settings Admin",
-            email="admin@taxini.com",
-            phone_number="+12345678900",
-            role="admin",
-            auth_status="verified"
-        )
-        session.add(admin_user)
-        session.commit()
-        session.refresh(admin_user)
-        
-        # Create admin profile
-        admin_profile = Admin(
-            user_id=admin_user.id,
-            test_column="settings_admin"
-        )
-        session.add(admin_profile)
-        session.commit()
-        
-        # Generate token
-        auth_service = AdminAuthService()
-        token = auth_service.create_admin_token(admin_user.id, admin_user.email)
-        return token
+    @pytest.fixture(scope="class")
+    def sample_settings(self, seed_session):
+        """Create sample settings once for the class; per-test updates are rolled back."""
+        with seed_session() as session:
+            with session.begin():
+                created_settings = bulk_seed(session, Settings, _SAMPLE_SETTINGS)
+            yield created_settings
 
-    @pytest.fixture
-    def sample_settings(self, session: Session):
-        """Create sample settings for testing."""
-        settings_data = [
-            {
-                "setting_key": "approach_fee_rate_per_km",
-                "setting_value": "0.5",
-                "data_type": "float",
-                "description": "Fee rate per kilometer for driver approach to pickup location (TND/km)",
-                "category": "pricing",
-                "is_active": True,
-                "is_editable": True
-            },
-            {
-                "setting_key": "base_fare",
-                "setting_value": "2.0",
-                "data_type": "float",
-                "description": "Base fare for all trips (TND)",
-                "category": "pricing",
-                "is_active": True,
-                "is_editable": True
-            },
-            {
-                "setting_key": "commission_rate",
-                "setting_value": "0.15",
-                "data_type": "float",
-                "description": "Platform commission rate (decimal, e.g., 0.15 = 15%)",
-                "category": "pricing",
-                "is_active": True,
-                "is_editable": True
-            },
-            {
-                "setting_key": "system_version",
-                "setting_value": "1.0.0",
-                "data_type": "string",
-                "description": "Current system version",
-                "category": "system",
-                "is_active": True,
-                "is_editable": False  # Read-only setting
-            }
-        ]
-        
-        created_settings = []
-        for setting_data in settings_data:
-            setting = Settings(**setting_data)
-            session.add(setting)
-            created_settings.append(setting)
-        
-        session.commit()
-        return created_settings
+    @pytest.fixture(scope="class")
+    def settings_list_response(self, _client_singleton, seed_session, admin_token: str, sample_settings):
+        """GET the full settings list once for the class; read-only tests assert on it."""
+        with seed_session() as session:
+            app.dependency_overrides[get_session] = lambda: session
+            try:
+                return _client_singleton.get(
+                    str(SETTINGS_URL),
+                    headers={"Authorization": f"Bearer {admin_token}", "X-API-Key": TEST_API_KEY}
+                )
+            finally:
+                app.dependency_overrides.pop(get_session, None)
 
-    def test_get_all_settings_success(self, client: TestClient, admin_token: str, sample_settings):
+    def test_get_all_settings_success(self, settings_list_response):
         """Test successful retrieval of all settings."""
-        headers = {
-            "Authorization": f"Bearer {admin_token}",
-            "X-API-Key": "Tw_82EVzdQY9pWSaNbN29MyxFCDESSRlcndy9SHwQnw"
-        }
-        
-        response = client.get("/api/v1/admin/settings", headers=headers)
+        response = settings_list_response
         
         assert response.status_code == 200
         data = response.json()
@@ -111,21 +99,12 @@ class TestAdminSettings:
         
         # Check that all required fields are present
         setting = data["data"][0]
-        required_fields = [
-            "id", "setting_key", "setting_value", "data_type",
-            "description", "category", "is_active", "is_editable"
-        ]
-        for field in required_fields:
+        for field in _REQUIRED_SETTING_FIELDS:
             assert field in setting
 
-    def test_get_settings_by_category(self, client: TestClient, admin_token: str, sample_settings):
+    async def test_get_settings_by_category(self, authed_client: AsyncClient, sample_settings):
         """Test filtering settings by category."""
-        headers = {
-            "Authorization": f"Bearer {admin_token}",
-            "X-API-Key": "Tw_82EVzdQY9pWSaNbN29MyxFCDESSRlcndy9SHwQnw"
-        }
-        
-        response = client.get("/api/v1/admin/settings?category=pricing", headers=headers)
+        response = await authed_client.get(SETTINGS_URL, params={"category": "pricing"})
         
         assert response.status_code == 200
         data = response.json()
@@ -135,14 +114,9 @@ class TestAdminSettings:
         for setting in data["data"]:
             assert setting["category"] == "pricing"
 
-    def test_get_specific_setting_success(self, client: TestClient, admin_token: str, sample_settings):
+    async def test_get_specific_setting_success(self, authed_client: AsyncClient, sample_settings):
         """Test successful retrieval of a specific setting."""
-        headers = {
-            "Authorization": f"Bearer {admin_token}",
-            "X-API-Key": "Tw_82EVzdQY9pWSaNbN29MyxFCDESSRlcndy9SHwQnw"
-        }
-        
-        response = client.get("/api/v1/admin/settings/approach_fee_rate_per_km", headers=headers)
+        response = await authed_client.get(APPROACH_FEE_URL)
         
         assert response.status_code == 200
         data = response.json()
@@ -153,36 +127,31 @@ class TestAdminSettings:
         assert setting["setting_value"] == "0.5"
         assert setting["data_type"] == "float"
 
-    def test_get_setting_not_found(self, client: TestClient, admin_token: str):
+    async def test_get_setting_not_found(self, authed_client: AsyncClient):
         """Test retrieval of non-existent setting."""
-        headers = {
-            "Authorization": f"Bearer {admin_token}",
-            "X-API-Key": "Tw_82EVzdQY9pWSaNbN29MyxFCDESSRlcndy9SHwQnw"
-        }
-        
-        response = client.get("/api/v1/admin/settings/non_existent_setting", headers=headers)
+        response = await authed_client.get(f"{SETTINGS_URL}/non_existent_setting")
         
         assert response.status_code == 404
         assert "not found" in response.json()["detail"]
 
-    def test_update_approach_fee_rate_success(self, client: TestClient, admin_token: str, sample_settings, session: Session):
-        """Test successful update of approach fee rate."""
-        headers = {
-            "Authorization": f"Bearer {admin_token}",
-            "X-API-Key": "Tw_82EVzdQY9pWSaNbN29MyxFCDESSRlcndy9SHwQnw",
-            "Content-Type": "application/json"
-        }
-        
-        update_data = {
-            "setting_value": "0.7",
-            "description": "Updated approach fee rate for better driver compensation"
-        }
-        
-        response = client.put(
-            "/api/v1/admin/settings/approach_fee_rate_per_km",
-            headers=headers,
-            json=update_data
-        )
+    @pytest.mark.parametrize(
+        "key,value,description",
+        [
+            ("approach_fee_rate_per_km", "0.7", "Updated approach fee rate for better driver compensation"),
+            ("base_fare", "2.5", None),
+            ("commission_rate", "0.20", "Increased commission rate to 20%"),
+        ],
+        ids=["approach_fee_rate", "base_fare", "commission_rate"],
+    )
+    async def test_update_setting_success(
+        self, authed_client: AsyncClient, sample_settings, session: Session, key, value, description
+    ):
+        """Test successful update of an editable setting, with and without a description."""
+        update_data = {"setting_value": value}
+        if description is not None:
+            update_data["description"] = description
+        
+        response = await authed_client.put(f"{SETTINGS_URL}/{key}", json=update_data)
         
         assert response.status_code == 200
         data = response.json()
@@ -191,176 +160,96 @@ class TestAdminSettings:
         assert "updated successfully" in data["message"]
         
         updated_setting = data["data"]
-        assert updated_setting["setting_value"] == "0.7"
-        assert updated_setting["description"] == update_data["description"]
+        assert updated_setting["setting_value"] == value
+        if description is not None:
+            assert updated_setting["description"] == description
         assert updated_setting["updated_at"] is not None
         
         # Verify in database
-        db_setting = session.exec(
-            select(Settings).where(Settings.setting_key == "approach_fee_rate_per_km")
-        ).first()
-        assert db_setting.setting_value == "0.7"
-
-    def test_update_base_fare_success(self, client: TestClient, admin_token: str, sample_settings):
-        """Test successful update of base fare."""
-        headers = {
-            "Authorization": f"Bearer {admin_token}",
-            "X-API-Key": "Tw_82EVzdQY9pWSaNbN29MyxFCDESSRlcndy9SHwQnw",
-            "Content-Type": "application/json"
-        }
-        
-        update_data = {"setting_value": "2.5"}
-        
-        response = client.put(
-            "/api/v1/admin/settings/base_fare",
-            headers=headers,
-            json=update_data
-        )
-        
-        assert response.status_code == 200
-        data = response.json()
-        
-        assert data["success"] is True
-        assert data["data"]["setting_value"] == "2.5"
+        db_setting = session.exec(select(Settings).where(Settings.setting_key == key)).first()
+        assert db_setting.setting_value == value
 
-    def test_update_commission_rate_success(self, client: TestClient, admin_token: str, sample_settings):
-        """Test successful update of commission rate."""
-        headers = {
-            "Authorization": f"Bearer {admin_token}",
-            "X-API-Key": "Tw_82EVzdQY9pWSaNbN29MyxFCDESSRlcndy9SHwQnw",
-            "Content-Type": "application/json"
-        }
-        
-        update_data = {
-            "setting_value": "0.20",
-            "description": "Increased commission rate to 20%"
-        }
-        
-        response = client.put(
-            "/api/v1/admin/settings/commission_rate",
-            headers=headers,
-            json=update_data
-        )
-        
-        assert response.status_code == 200
-        data = response.json()
-        
-        assert data["success"] is True
-        assert data["data"]["setting_value"] == "0.20"
-
-    def test_update_readonly_setting_fails(self, client: TestClient, admin_token: str, sample_settings):
+    async def test_update_readonly_setting_fails(self, authed_client: AsyncClient, sample_settings):
         """Test that updating a read-only setting fails."""
-        headers = {
-            "Authorization": f"Bearer {admin_token}",
-            "X-API-Key": "Tw_82EVzdQY9pWSaNbN29MyxFCDESSRlcndy9SHwQnw",
-            "Content-Type": "application/json"
-        }
-        
         update_data = {"setting_value": "2.0.0"}
         
-        response = client.put(
-            "/api/v1/admin/settings/system_version",
-            headers=headers,
+        response = await authed_client.put(
+            f"{SETTINGS_URL}/system_version",
             json=update_data
         )
         
         assert response.status_code == 400
         assert "not editable" in response.json()["detail"]
 
-    def test_update_setting_not_found(self, client: TestClient, admin_token: str):
+    async def test_update_setting_not_found(self, authed_client: AsyncClient):
         """Test updating non-existent setting."""
-        headers = {
-            "Authorization": f"Bearer {admin_token}",
-            "X-API-Key": "Tw_82EVzdQY9pWSaNbN29MyxFCDESSRlcndy9SHwQnw",
-            "Content-Type": "application/json"
-        }
-        
         update_data = {"setting_value": "1.0"}
         
-        response = client.put(
-            "/api/v1/admin/settings/non_existent_setting",
-            headers=headers,
+        response = await authed_client.put(
+            f"{SETTINGS_URL}/non_existent_setting",
             json=update_data
         )
         
         assert response.status_code == 404
         assert "not found" in response.json()["detail"]
 
-    def test_update_setting_invalid_value_type(self, client: TestClient, admin_token: str, sample_settings):
+    async def test_update_setting_invalid_value_type(self, authed_client: AsyncClient, sample_settings):
         """Test updating setting with invalid value type."""
-        headers = {
-            "Authorization": f"Bearer {admin_token}",
-            "X-API-Key": "Tw_82EVzdQY9pWSaNbN29MyxFCDESSRlcndy9SHwQnw",
-            "Content-Type": "application/json"
-        }
-        
         # Try to set non-numeric value for float setting
         update_data = {"setting_value": "invalid_number"}
         
-        response = client.put(
-            "/api/v1/admin/settings/approach_fee_rate_per_km",
-            headers=headers,
+        response = await authed_client.put(
+            APPROACH_FEE_URL,
             json=update_data
         )
         
         assert response.status_code == 400
         assert "Invalid value" in response.json()["detail"]
 
-    def test_update_setting_missing_value(self, client: TestClient, admin_token: str):
+    async def test_update_setting_missing_value(self, authed_client: AsyncClient):
         """Test updating setting without providing value."""
-        headers = {
-            "Authorization": f"Bearer {admin_token}",
-            "X-API-Key": "Tw_82EVzdQY9pWSaNbN29MyxFCDESSRlcndy9SHwQnw",
-            "Content-Type": "application/json"
-        }
-        
-        response = client.put(
-            "/api/v1/admin/settings/approach_fee_rate_per_km",
-            headers=headers,
+        response = await authed_client.put(
+            APPROACH_FEE_URL,
             json={}
         )
         
         assert response.status_code == 422  # Validation error
 
-    def test_settings_unauthorized(self, client: TestClient):
-        """Test settings endpoints without authentication."""
-        # Test GET
-        response = client.get("/api/v1/admin/settings")
-        assert response.status_code == 401
-        
-        # Test PUT
-        response = client.put(
-            "/api/v1/admin/settings/approach_fee_rate_per_km",
-            json={"setting_value": "0.8"}
-        )
-        assert response.status_code == 401
-
-    def test_settings_invalid_token(self, client: TestClient):
-        """Test settings endpoints with invalid token."""
-        headers = {
-            "Authorization": "Bearer invalid_token",
-            "X-API-Key": "Tw_82EVzdQY9pWSaNbN29MyxFCDESSRlcndy9SHwQnw"
-        }
-        
-        response = client.get("/api/v1/admin/settings", headers=headers)
-        assert response.status_code == 401
-
-    def test_settings_missing_api_key(self, client: TestClient, admin_token: str):
-        """Test settings endpoints without API key."""
-        headers = {"Authorization": f"Bearer {admin_token}"}
-        
-        response = client.get("/api/v1/admin/settings", headers=headers)
-        assert response.status_code == 401
+    @pytest.mark.parametrize(
+        "method,url,body",
+        [
+            ("GET", SETTINGS_URL, None),
+            ("PUT", APPROACH_FEE_URL, {"setting_value": "0.8"}),
+        ],
+        ids=["get", "put"],
+    )
+    @pytest.mark.parametrize(
+        "build_headers",
+        [
+            lambda token: {},
+            lambda token: {"Authorization": "Bearer invalid_token", "X-API-Key": TEST_API_KEY},
+            lambda token: {"Authorization": f"Bearer {token}"},
+        ],
+        ids=["no-credentials", "invalid-token", "missing-api-key"],
+    )
+    async def test_settings_rejects_bad_credentials(
+        self, asgi_status, admin_token: str, build_headers, method, url, body
+    ):
+        """Test settings endpoints reject missing credentials, a bad token, or a missing API key."""
+        headers = build_headers(admin_token)
+        payload = b""
+        if body is not None:
+            headers = {**headers, "Content-Type": "application/json"}
+            payload = json.dumps(body).encode()
+        
+        assert await asgi_status(method, url.path, headers, payload) == 401
 
-    def test_settings_response_structure(self, client: TestClient, admin_token: str, sample_settings):
+    async def test_settings_response_structure(
+        self, authed_client: AsyncClient, settings_list_response, sample_settings
+    ):
         """Test that settings responses have correct structure."""
-        headers = {
-            "Authorization": f"Bearer {admin_token}",
-            "X-API-Key": "Tw_82EVzdQY9pWSaNbN29MyxFCDESSRlcndy9SHwQnw"
-        }
-        
-        # Test GET all settings
-        response = client.get("/api/v1/admin/settings", headers=headers)
+        # GET all settings
+        response = settings_list_response
         assert response.status_code == 200
         
         data = response.json()
@@ -369,7 +258,7 @@ class TestAdminSettings:
         assert isinstance(data["data"], list)
         
         # Test GET specific setting
-        response = client.get("/api/v1/admin/settings/base_fare", headers=headers)
+        response = await authed_client.get(f"{SETTINGS_URL}/base_fare")
         assert response.status_code == 200
         
         data = response.json()
@@ -377,18 +266,12 @@ class TestAdminSettings:
         assert "data" in data
         assert isinstance(data["data"], dict)
 
-    def test_settings_value_type_conversion(self, client: TestClient, admin_token: str, sample_settings):
+    def test_settings_value_type_conversion(self, settings_list_response):
         """Test that setting values are properly converted based on data type."""
-        headers = {
-            "Authorization": f"Bearer {admin_token}",
-            "X-API-Key": "Tw_82EVzdQY9pWSaNbN29MyxFCDESSRlcndy9SHwQnw"
-        }
+        settings_by_key = {setting["setting_key"]: setting for setting in settings_list_response.json()["data"]}
         
         # Test float conversion
-        response = client.get("/api/v1/admin/settings/approach_fee_rate_per_km", headers=headers)
-        assert response.status_code == 200
-        
-        setting = response.json()["data"]
+        setting = settings_by_key["approach_fee_rate_per_km"]
         assert setting["data_type"] == "float"
         # Value should be stored as string but convertible to float
         assert float(setting["setting_value"]) == 0.5
@@ -0,0 +1,21 @@
+"""
+Unit tests for admin statistics on an empty database.
+
+Kept apart from test_admin_services.py, whose module-scoped seed data would
+otherwise be visible here.
+"""
+
+from sqlmodel import Session
+
+from src.services.admin_stats import AdminStatsService
+
+
+def test_get_global_statistics_empty_database(empty_session: Session):
+    """Test global statistics with empty database."""
+    stats = AdminStatsService.get_global_statistics(empty_session)
+    
+    # Should return zeros for empty database
+    assert stats["total_users"] == 0
+    assert stats["total_trips"] == 0
+    assert stats["total_revenue"] == 0.0
+    assert stats["completion_rate"] == 0.0
@@ -0,0 +1,66 @@
+"""
+Benchmark for the admin trip history listing endpoint.
+
+Measured with `pytest --codspeed`; without the flag it runs as a plain test.
+"""
+
+import pytest
+from datetime import datetime, timedelta
+from fastapi.testclient import TestClient
+
+from src.models.user import User
+from src.models.trip import Trip, TripBase
+from tests.helpers import TEST_API_KEY, bulk_seed
+
+TRIP_COUNT = 1000
+STATUSES = ("completed", "cancelled", "started", "requested")
+
+
+@pytest.fixture(scope="module")
+def bench_trips(seed_session):
+    """Seed TRIP_COUNT trips between one rider and one driver for the module."""
+    with seed_session() as session:
+        with session.begin():
+            rider, driver = bulk_seed(session, User, [
+                {
+                    "auth_id": f"bench-{role}",
+                    "name": f"Bench {role.title()}",
+                    "email": f"bench-{role}@example.com",
+                    "phone_number": phone,
+                    "role": role,
+                    "auth_status": "verified"
+                }
+                for role, phone in (("rider", "+17000000001"), ("driver", "+17000000002"))
+            ])
+            now = datetime.utcnow()
+            bulk_seed(session, Trip, [
+                TripBase(
+                    rider_id=rider["id"],
+                    driver_id=driver["id"],
+                    pickup_latitude=36.8065,
+                    pickup_longitude=10.1815,
+                    pickup_address=f"Pickup {i}, Tunis",
+                    destination_latitude=36.8190,
+                    destination_longitude=10.1658,
+                    destination_address=f"Destination {i}, Tunis",
+                    status=STATUSES[i % len(STATUSES)],
+                    estimated_distance_km=5.0 + i % 20,
+                    estimated_cost_tnd=10.0 + i % 30,
+                    requested_at=now - timedelta(minutes=i),
+                ).model_dump()
+                | {"created_at": now - timedelta(minutes=i)}
+                for i in range(TRIP_COUNT)
+            ])
+        yield
+
+
+@pytest.mark.benchmark
+@pytest.mark.usefixtures("bench_trips")
+def test_list_trips_benchmark(benchmark, client: TestClient, admin_token: str):
+    """Track the cost of listing one page of trips from a large history."""
+    headers = {"Authorization": f"Bearer {admin_token}", "X-API-Key": TEST_API_KEY}
+
+    response = benchmark(client.get, "/api/v1/admin/trips", params={"page_size": 50}, headers=headers)
+
+    assert response.status_code == 200
+    assert len(response.json()["data"]) == 50
@@ -0,0 +1,181 @@
+"""
+Tests for the async database path: get_async_db, the *_async services and the endpoints using them.
+"""
+
+import pytest
+from unittest.mock import patch
+from httpx import AsyncClient
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.app import app
+from src.db import session as db_session
+from src.models.user import User, Driver, Rider
+from src.models.trip import Trip
+from src.schemas.auth import CurrentUser
+from src.services.auth import AuthService
+from src.services.trip import TripService
+from src.services.users import UserService
+from tests.helpers import TEST_API_KEY
+
+API_HEADERS = {"X-API-Key": TEST_API_KEY}
+
+
+async def _seed_trip(session: AsyncSession, status: str = "accepted"):
+    """Create a rider, a driver with a profile, and one trip between them."""
+    rider = User(
+        auth_id="async-rider", name="Async Rider", email="async.rider@example.com",
+        phone_number="+1700000101", role="rider", auth_status="verified"
+    )
+    driver_user = User(
+        auth_id="async-driver", name="Async Driver", email="async.driver@example.com",
+        phone_number="+1700000102", role="driver", auth_status="verified"
+    )
+    session.add_all([rider, driver_user])
+    await session.flush()
+
+    driver = Driver(user_id=driver_user.id, taxi_number="ASYNC-1", account_status="verified")
+    session.add_all([driver, Rider(user_id=rider.id, residence_place="Tunis")])
+    session.add(Trip(
+        rider_id=rider.id,
+        driver_id=driver_user.id,
+        pickup_latitude=36.8065,
+        pickup_longitude=10.1815,
+        pickup_address="Tunis Center, Tunisia",
+        destination_latitude=36.8190,
+        destination_longitude=10.1658,
+        destination_address="La Marsa Beach, Tunisia",
+        status=status,
+    ))
+    await session.commit()
+    return rider, driver_user, driver
+
+
+@pytest.fixture
+def as_user():
+    """Authenticate requests as the given auth_id by overriding the current-user dependency."""
+    def _as_user(auth_id: str):
+        app.dependency_overrides[AuthService.get_current_user_dependency] = lambda: CurrentUser(auth_id=auth_id)
+
+    yield _as_user
+    app.dependency_overrides.pop(AuthService.get_current_user_dependency, None)
+
+
+@pytest.mark.parametrize(
+    "db_url,expected_ssl",
+    [
+        ("postgresql://postgres:pw@db.example.com:5432/postgres?sslmode=require", "require"),
+        ("postgresql://postgres:pw@db.example.com:5432/postgres", None),
+    ],
+    ids=["sslmode", "no-sslmode"],
+)
+def test_async_database_url_moves_sslmode_to_connect_args(monkeypatch, db_url, expected_ssl):
+    """Test the asyncpg URL drops libpq's sslmode and passes it as asyncpg's `ssl` instead."""
+    monkeypatch.setattr(db_session, "get_database_url", lambda: db_url)
+
+    url, connect_args = db_session.get_async_database_url()
+
+    assert url.drivername == "postgresql+asyncpg"
+    assert "sslmode" not in url.query
+    assert url.host == "db.example.com" and url.database == "postgres"
+    assert connect_args.get("ssl") == expected_ssl
+
+
+class TestAsyncServices:
+    """Test the async service variants against an aiosqlite session."""
+
+    async def test_get_user_by_auth_id_async(self, async_db_session: AsyncSession):
+        """Test user lookup by auth ID, found and missing."""
+        rider, _, _ = await _seed_trip(async_db_session)
+
+        user = await UserService.get_user_by_auth_id_async(async_db_session, "async-rider")
+
+        assert user is not None and user.id == rider.id
+        assert await UserService.get_user_by_auth_id_async(async_db_session, "missing") is None
+
+    async def test_get_email_by_phone_async(self, async_db_session: AsyncSession):
+        """Test email lookup by phone number, found and missing."""
+        await _seed_trip(async_db_session)
+
+        assert await UserService.get_email_by_phone_async(async_db_session, "+1700000101") == "async.rider@example.com"
+        assert await UserService.get_email_by_phone_async(async_db_session, "+1799999999") is None
+
+    async def test_get_driver_active_trip_async(self, async_db_session: AsyncSession):
+        """Test the driver's active trip is found by driver profile ID."""
+        _, driver_user, driver = await _seed_trip(async_db_session)
+
+        trip = await TripService.get_driver_active_trip_async(async_db_session, driver.id)
+
+        assert trip is not None and trip.driver_id == driver_user.id
+        assert await TripService.get_driver_active_trip_async(async_db_session, "missing") is None
+
+    @pytest.mark.parametrize("status,active", [("accepted", True), ("cancelled", False)])
+    async def test_get_rider_active_trip_async(self, async_db_session: AsyncSession, status, active):
+        """Test the rider's active trip excludes cancelled trips."""
+        rider, _, _ = await _seed_trip(async_db_session, status=status)
+
+        trip = await TripService.get_rider_active_trip_async(async_db_session, rider.id)
+
+        assert (trip is not None) is active
+
+
+class TestAsyncEndpoints:
+    """Test the endpoints served through get_async_db."""
+
+    async def test_reset_password_looks_up_email(self, async_client: AsyncClient, async_db_session: AsyncSession):
+        """Test reset-password resolves the email from the async session."""
+        await _seed_trip(async_db_session)
+
+        with patch.object(AuthService, "reset_password_with_fallback") as mock_reset:
+            mock_reset.return_value = {"success": True, "message": "sent"}
+            response = await async_client.post(
+                "/api/v1/users/reset-password",
+                json={"phone_number": "+1700000101"},
+                headers=API_HEADERS
+            )
+
+        assert response.status_code == 200
+        mock_reset.assert_called_once_with("async.rider@example.com")
+
+    async def test_reset_password_unknown_phone(self, async_client: AsyncClient, async_db_session: AsyncSession):
+        """Test reset-password returns 404 when no user has the phone number."""
+        response = await async_client.post(
+            "/api/v1/users/reset-password",
+            json={"phone_number": "+1799999999"},
+            headers=API_HEADERS
+        )
+
+        assert response.status_code == 404
+
+    async def test_driver_active_trip(self, async_client: AsyncClient, async_db_session: AsyncSession, as_user):
+        """Test the driver active-trip endpoint returns the accepted trip."""
+        await _seed_trip(async_db_session)
+        as_user("async-driver")
+
+        response = await async_client.get("/api/v1/drivers/active-trip", headers=API_HEADERS)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["has_active_trip"] is True
+        assert data["trip"]["rider_name"] == "Async Rider"
+
+    async def test_rider_active_trip(self, async_client: AsyncClient, async_db_session: AsyncSession, as_user):
+        """Test the rider active-trip endpoint returns the trip with its driver."""
+        await _seed_trip(async_db_session)
+        as_user("async-rider")
+
+        response = await async_client.get("/api/v1/riders/active-trip", headers=API_HEADERS)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["has_active_trip"] is True
+        assert data["trip"]["driver"]["taxi_number"] == "ASYNC-1"
+
+    async def test_rider_active_trip_none(self, async_client: AsyncClient, async_db_session: AsyncSession, as_user):
+        """Test the rider active-trip endpoint when the only trip is cancelled."""
+        await _seed_trip(async_db_session, status="cancelled")
+        as_user("async-rider")
+
+        response = await async_client.get("/api/v1/riders/active-trip", headers=API_HEADERS)
+
+        assert response.status_code == 200
+        assert response.json()["has_active_trip"] is False
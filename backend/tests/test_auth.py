@@ -3,88 +3,140 @@ Tests for authentication service and endpoints.
 """
 
 import pytest
+import time
 from unittest.mock import patch, Mock
 from fastapi.testclient import TestClient
 
+from src.services import auth
 from src.services.auth import AuthService
 
 
+@pytest.fixture(autouse=True)
+def clear_verified_tokens():
+    """Start and finish every test with an empty development-token cache."""
+    auth._verified_tokens.clear()
+    yield
+    auth._verified_tokens.clear()
+
+
 class TestAuthService:
     """Test cases for AuthService class."""
 
-    def test_send_otp_success(self, mock_supabase):
-        """Test successful OTP sending."""
+    @pytest.mark.parametrize(
+        "error,expected_message",
+        [(None, "OTP sent successfully"), ("Invalid phone number", "Invalid phone number")],
+        ids=["success", "failure"],
+    )
+    def test_send_otp(self, mock_supabase, supabase_auth_error, error, expected_message):
+        """Test OTP sending with a successful and a failing Supabase response."""
         phone_number = "+1234567890"
+        if error:
+            supabase_auth_error("sign_in_with_otp", error)
         
         result = AuthService.send_otp(phone_number)
         
-        assert result["success"] is True
-        assert "OTP sent successfully" in result["message"]
+        assert result["success"] is (error is None)
+        assert expected_message in result["message"]
         mock_supabase.auth.sign_in_with_otp.assert_called_once()
 
-    def test_send_otp_failure(self, mock_supabase):
-        """Test OTP sending failure."""
-        phone_number = "+1234567890"
-        mock_supabase.auth.sign_in_with_otp.return_value = {
-            "data": None,
-            "error": {"message": "Invalid phone number"}
-        }
-        
-        result = AuthService.send_otp(phone_number)
-        
-        assert result["success"] is False
-        assert "Invalid phone number" in result["message"]
-
-    def test_verify_otp_success(self, mock_supabase):
-        """Test successful OTP verification."""
+    @pytest.mark.parametrize(
+        "otp_code,error,expected_message",
+        [("123456", None, "Phone number verified successfully"), ("wrong_otp", "Invalid OTP", "Invalid OTP")],
+        ids=["success", "failure"],
+    )
+    def test_verify_otp(self, mock_supabase, supabase_auth_error, otp_code, error, expected_message):
+        """Test OTP verification with a successful and a failing Supabase response."""
         phone_number = "+1234567890"
-        otp_code = "123456"
+        if error:
+            supabase_auth_error("verify_otp", error)
         
         result = AuthService.verify_otp(phone_number, otp_code)
         
-        assert result["success"] is True
-        assert "Phone number verified successfully" == result["message"]
-        assert "session" in result  # Updated to match new response format
-        assert "user" in result
+        assert result["success"] is (error is None)
+        assert expected_message in result["message"]
         mock_supabase.auth.verify_otp.assert_called_once()
-
-    def test_verify_otp_failure(self, mock_supabase):
-        """Test OTP verification failure."""
-        phone_number = "+1234567890"
-        otp_code = "wrong_otp"
-        mock_supabase.auth.verify_otp.return_value = {
-            "data": None,
-            "error": {"message": "Invalid OTP"}
-        }
-        
-        result = AuthService.verify_otp(phone_number, otp_code)
-        
-        assert result["success"] is False
-        assert "Invalid OTP" in result["message"]
-
-    def test_get_user_by_token_success(self, mock_supabase):
-        """Test successful user retrieval by token."""
-        access_token = "valid_token"
+        if error is None:
+            assert result["message"] == expected_message
+            assert "session" in result  # Updated to match new response format
+            assert "user" in result
+
+    @pytest.mark.parametrize(
+        "access_token,error",
+        [("valid_token", None), ("invalid_token", "Invalid token")],
+        ids=["success", "failure"],
+    )
+    def test_get_user_by_token(self, mock_supabase, supabase_auth_error, access_token, error):
+        """Test user retrieval by token with a successful and a failing Supabase response."""
+        if error:
+            supabase_auth_error("get_user", error)
         
         result = AuthService.get_user_by_token(access_token)
         
-        assert result["success"] is True
-        assert "user" in result
-        assert result["user"]["id"] == "test_user_id"
+        assert result["success"] is (error is None)
         mock_supabase.auth.get_user.assert_called_once_with(access_token)
+        if error is None:
+            assert result["user"]["id"] == "test_user_id"
+        else:
+            assert error in result["message"]
 
-    def test_get_user_by_token_failure(self, mock_supabase):
-        """Test user retrieval failure with invalid token."""
-        access_token = "invalid_token"
-        mock_supabase.auth.get_user.return_value = {
-            "data": None,
-            "error": {"message": "Invalid token"}
-        }
-        
-        result = AuthService.get_user_by_token(access_token)
-        
-        assert result["success"] is False
-        assert "Invalid token" in result["message"]
+    def test_dev_token_claims_are_cached(self):
+        """Test that a verified development JWT is not re-verified within the cache window."""
+        import jwt
+
+        token = jwt.encode({"sub": "cached-user", "exp": time.time() + 600}, "secret", algorithm="HS256")
+
+        with patch("jwt.decode", wraps=jwt.decode) as mock_decode:
+            first = auth._decode_dev_token(token, "secret", "HS256")
+            second = auth._decode_dev_token(token, "secret", "HS256")
+
+        assert first == second
+        assert first["sub"] == "cached-user"
+        mock_decode.assert_called_once()
+
+    def test_dev_token_cache_respects_expiry(self):
+        """Test that cached claims are not served past the token's exp claim."""
+        import jwt
+
+        exp = time.time() + 600
+        token = jwt.encode({"sub": "expiring-user", "exp": exp}, "secret", algorithm="HS256")
+        auth._decode_dev_token(token, "secret", "HS256")
+
+        # Once the token's exp has passed the entry must fall through to jwt.decode
+        with patch("src.services.auth.time.time", return_value=exp + 1), \
+             patch("jwt.decode", side_effect=jwt.ExpiredSignatureError):
+            with pytest.raises(jwt.ExpiredSignatureError):
+                auth._decode_dev_token(token, "secret", "HS256")
+
+        assert len(auth._verified_tokens) == 0
+
+    def test_dev_token_cache_rechecks_rotated_secret(self):
+        """Test that a cached token is re-verified when the secret it was checked with changes."""
+        import jwt
+
+        token = jwt.encode({"sub": "rotated-user", "exp": time.time() + 600}, "old-secret", algorithm="HS256")
+        auth._decode_dev_token(token, "old-secret", "HS256")
+
+        with pytest.raises(jwt.InvalidSignatureError):
+            auth._decode_dev_token(token, "new-secret", "HS256")
+
+    def test_dev_token_cache_returns_copies(self):
+        """Test that mutating returned claims does not change what later requests get."""
+        import jwt
+
+        token = jwt.encode({"sub": "copied-user", "exp": time.time() + 600}, "secret", algorithm="HS256")
+        auth._decode_dev_token(token, "secret", "HS256")["sub"] = "tampered"
+
+        assert auth._decode_dev_token(token, "secret", "HS256")["sub"] == "copied-user"
+
+    def test_dev_token_cache_evicts_oldest(self):
+        """Test that the cache stays bounded by dropping the oldest token."""
+        cache = auth._TokenCache(max_size=2)
+        for token in ("a", "b", "c"):
+            cache.set(token, time.time() + 60, {"sub": token})
+
+        assert len(cache) == 2
+        assert cache.get("a", time.time()) is None
+        assert cache.get("c", time.time()) == {"sub": "c"}
 
 
 class TestAuthEndpoints:
@@ -152,12 +204,9 @@ class TestAuthEndpoints:
         
         assert response.status_code == 401
 
-    def test_auth_me_endpoint_invalid_token(self, client: TestClient, mock_supabase):
+    def test_auth_me_endpoint_invalid_token(self, client: TestClient, supabase_auth_error):
         """Test /auth/me endpoint with invalid token."""
-        mock_supabase.auth.get_user.return_value = {
-            "data": None,
-            "error": {"message": "Invalid token"}
-        }
+        supabase_auth_error("get_user", "Invalid token")
         
         response = client.get(
             "/api/v1/auth/me",
@@ -3,18 +3,17 @@ Test for password reset functionality.
 """
 
 import pytest
-from unittest.mock import MagicMock, patch, ANY
+from unittest.mock import AsyncMock, MagicMock, patch, ANY
 from starlette.testclient import TestClient
-from src.app import app
 
 
 class TestPasswordReset:
     """Test password reset functionality."""
 
     @pytest.fixture
-    def client(self):
-        """Create test client."""
-        return TestClient(app)
+    def client(self, _client_singleton):
+        """Reuse the run-wide test client, without the conftest session override."""
+        return _client_singleton
 
     @pytest.fixture 
     def mock_session(self):
@@ -27,8 +26,8 @@ class TestPasswordReset:
     def test_reset_password_success(self, client: TestClient, mock_session):
         """Test successful password reset."""
         
-        # Mock UserService.get_email_by_phone to return an email
-        with patch('src.services.users.UserService.get_email_by_phone') as mock_get_email:
+        # Mock UserService.get_email_by_phone_async to return an email
+        with patch('src.services.users.UserService.get_email_by_phone_async', new_callable=AsyncMock) as mock_get_email:
             mock_get_email.return_value = "test@example.com"
             
             # Mock AuthService.reset_password to return success
@@ -50,14 +49,14 @@ class TestPasswordReset:
                 assert "password reset email sent" in data["message"].lower()
                 
                 # Verify the services were called with correct parameters
-                mock_get_email.assert_called_once_with(ANY, "+1234567890")
+                mock_get_email.assert_awaited_once_with(ANY, "+1234567890")
                 mock_reset.assert_called_once_with("test@example.com")
 
     def test_reset_password_phone_not_found(self, client: TestClient, mock_session):
         """Test password reset when phone number is not found."""
         
-        # Mock UserService.get_email_by_phone to return None
-        with patch('src.services.users.UserService.get_email_by_phone') as mock_get_email:
+        # Mock UserService.get_email_by_phone_async to return None
+        with patch('src.services.users.UserService.get_email_by_phone_async', new_callable=AsyncMock) as mock_get_email:
             mock_get_email.return_value = None
             
             response = client.post(
@@ -84,8 +83,8 @@ class TestPasswordReset:
     def test_reset_password_auth_service_failure(self, client: TestClient, mock_session):
         """Test password reset when AuthService fails."""
         
-        # Mock UserService.get_email_by_phone to return an email
-        with patch('src.services.users.UserService.get_email_by_phone') as mock_get_email:
+        # Mock UserService.get_email_by_phone_async to return an email
+        with patch('src.services.users.UserService.get_email_by_phone_async', new_callable=AsyncMock) as mock_get_email:
             mock_get_email.return_value = "test@example.com"
             
             # Mock AuthService.reset_password to return failure
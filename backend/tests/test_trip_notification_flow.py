@@ -16,9 +16,7 @@ import json
 from unittest.mock import Mock, patch
 from datetime import datetime
 from sqlmodel import Session
-from fastapi.testclient import TestClient
 
-from src.app import app
 from src.models.user import User, Driver
 from src.models.trip import Trip, TripStatus
 from src.services.trip import TripService
@@ -32,9 +30,9 @@ class TestTripNotificationFlow:
     """Test the complete trip notification flow."""
     
     @pytest.fixture
-    def client(self):
-        """Create test client."""
-        return TestClient(app)
+    def client(self, _client_singleton):
+        """Reuse the run-wide test client, without the conftest session override."""
+        return _client_singleton
     
     @pytest.fixture
     def mock_driver(self, test_session: Session):
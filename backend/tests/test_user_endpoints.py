@@ -7,7 +7,13 @@ from fastapi.testclient import TestClient
 from unittest.mock import patch, Mock
 import io
 
+from src.app import app
+from src.core.settings import settings
 from src.models.enums import UserRole
+from src.schemas.auth import CurrentUser
+from src.services.auth import AuthService
+from src.services.users import UserService
+from tests.helpers import TEST_API_KEY
 
 
 class TestUserEndpoints:
@@ -215,6 +221,33 @@ class TestProfileUpdateSecurity:
         assert data["user"]["name"] == "John Updated Driver"
         assert data["user"]["email"] == "john.updated@example.com"
 
+    def test_dev_mode_email_update_invalidates_cache(self, client: TestClient, session, fake_redis, monkeypatch):
+        """Test the development-mode update path also drops the cached email lookups."""
+        user = UserService.create_user_profile(
+            session=session,
+            auth_id="dev_auth_id",
+            name="Dev Driver",
+            email="dev@example.com",
+            phone_number="+1234567890",
+            role=UserRole.DRIVER,
+            role_specific_data={"taxi_number": "TAXI-123"}
+        )["user"]
+        fake_redis.update({"email:phone:+1234567890": "dev@example.com", "email:authid:dev_auth_id": "dev@example.com"})
+
+        # In development mode the current user's auth_id carries the user ID
+        monkeypatch.setattr(settings, "development_mode", True)
+        app.dependency_overrides[AuthService.get_current_user_dependency] = lambda: CurrentUser(auth_id=user.id)
+
+        response = client.post(
+            "/api/v1/users/update-profile",
+            json={"email": "dev.new@example.com"},
+            headers={"X-API-Key": TEST_API_KEY}
+        )
+
+        assert response.status_code == 200
+        assert response.json()["user"]["email"] == "dev.new@example.com"
+        assert fake_redis == {}
+
     def test_shared_fields_can_be_updated(self, client: TestClient, mock_supabase, valid_auth_headers):
         """Test that shared fields can be updated by any user."""
         # Create a profile first
@@ -2,10 +2,13 @@
 Tests for user service functionality.
 """
 
+import io
 import pytest
+from fastapi import HTTPException, UploadFile
 from sqlmodel import Session
 from unittest.mock import patch
 
+from src.core.settings import settings
 from src.services.users import UserService
 from src.models.user import User, Driver, Rider, Admin
 from src.models.enums import UserRole
@@ -130,6 +133,25 @@ class TestUserService:
         assert user.name == "Test User"
         assert user.auth_id == "test_auth_id"
 
+    def test_get_user_by_auth_id_reuses_session_cache(self, session: Session):
+        """Test repeated lookups in one session skip the database."""
+        UserService.create_user_profile(
+            session=session,
+            auth_id="test_auth_id",
+            name="Test User",
+            email="test@example.com",
+            phone_number="+1234567890",
+            role=UserRole.RIDER,
+            role_specific_data={"residence_place": "Downtown"}
+        )
+        
+        first = UserService.get_user_by_auth_id(session, "test_auth_id")
+        with patch.object(session, "exec", wraps=session.exec) as mock_exec:
+            second = UserService.get_user_by_auth_id(session, "test_auth_id")
+        
+        assert second is first
+        mock_exec.assert_not_called()
+
     def test_get_user_by_auth_id_not_found(self, session: Session):
         """Test user retrieval with non-existent auth ID."""
         user = UserService.get_user_by_auth_id(session, "non_existent_auth_id")
@@ -233,3 +255,120 @@ class TestUserService:
         assert result["success"] is True
         assert result["total_profiles"] == 0
         assert len(result["profiles"]) == 0
+
+
+class TestEmailCache:
+    """Test the Redis-cached password-reset email lookups and their invalidation."""
+
+    PHONE_KEY = "email:phone:+1234567890"
+    AUTH_ID_KEY = "email:authid:test_auth_id"
+
+    @pytest.fixture
+    def user(self, session: Session) -> User:
+        """Create a driver whose email lookups are cached by the tests."""
+        return UserService.create_user_profile(
+            session=session,
+            auth_id="test_auth_id",
+            name="John Driver",
+            email="john@example.com",
+            phone_number="+1234567890",
+            role=UserRole.DRIVER,
+            role_specific_data={"taxi_number": "TAXI-123"}
+        )["user"]
+
+    def test_lookup_miss_populates_cache(self, session: Session, user: User, fake_redis: dict):
+        """Test a cache miss reads the database and stores the email."""
+        assert UserService.get_email_by_phone(session, "+1234567890") == "john@example.com"
+        assert UserService.get_email_by_auth_id(session, "test_auth_id") == "john@example.com"
+
+        assert fake_redis == {self.PHONE_KEY: "john@example.com", self.AUTH_ID_KEY: "john@example.com"}
+
+    def test_lookup_unknown_phone_is_not_cached(self, session: Session, fake_redis: dict):
+        """Test a lookup that finds no user leaves the cache empty."""
+        assert UserService.get_email_by_phone(session, "+1999999999") is None
+        assert fake_redis == {}
+
+    def test_lookup_hit_skips_database(self, fake_redis: dict):
+        """Test a cache hit is returned without touching the session."""
+        fake_redis[self.PHONE_KEY] = "cached@example.com"
+
+        assert UserService.get_email_by_phone(None, "+1234567890") == "cached@example.com"
+
+    async def test_async_lookup_hit_skips_database(self, fake_redis: dict):
+        """Test the async lookup serves hits from the same cache."""
+        fake_redis[self.PHONE_KEY] = "cached@example.com"
+
+        assert await UserService.get_email_by_phone_async(None, "+1234567890") == "cached@example.com"
+
+    @pytest.mark.parametrize(
+        "user_data,stale_keys",
+        [
+            ({"email": "john.new@example.com"}, {PHONE_KEY, AUTH_ID_KEY}),
+            ({"phone_number": "+1987654321"}, {PHONE_KEY, AUTH_ID_KEY, "email:phone:+1987654321"}),
+        ],
+        ids=["email", "phone_number"],
+    )
+    def test_update_user_profile_invalidates(self, session: Session, user: User, fake_redis: dict, user_data, stale_keys):
+        """Test changing email or phone drops the cached lookups for the old and new phone."""
+        fake_redis.update({key: "john@example.com" for key in stale_keys})
+        fake_redis["email:phone:+1555000000"] = "other@example.com"
+
+        result = UserService.update_user_profile(session, user.id, user_data)
+
+        assert result["success"] is True
+        assert fake_redis == {"email:phone:+1555000000": "other@example.com"}
+
+    def test_update_user_profile_name_keeps_cache(self, session: Session, user: User, fake_redis: dict):
+        """Test a name-only update leaves the email cache alone."""
+        fake_redis[self.PHONE_KEY] = "john@example.com"
+
+        UserService.update_user_profile(session, user.id, {"name": "John Renamed"})
+
+        assert fake_redis == {self.PHONE_KEY: "john@example.com"}
+
+    def test_update_shared_data_invalidates(self, session: Session, user: User, fake_redis: dict):
+        """Test the cross-profile email update drops the cached lookups."""
+        UserService.get_email_by_phone(session, "+1234567890")
+        UserService.get_email_by_auth_id(session, "test_auth_id")
+
+        result = UserService.update_shared_data_across_profiles(
+            session, "test_auth_id", {"email": "john.new@example.com"}
+        )
+
+        assert result["success"] is True
+        assert fake_redis == {}
+        assert UserService.get_email_by_phone(session, "+1234567890") == "john.new@example.com"
+
+
+class TestDriverUploads:
+    """Test the concurrent driver document uploads."""
+
+    @staticmethod
+    def _upload(name: str, size: int) -> UploadFile:
+        return UploadFile(file=io.BytesIO(b"x" * size), filename=name)
+
+    async def test_prepare_driver_data_uploads_both_files(self):
+        """Test both documents are uploaded and their URLs stored by field."""
+        with patch("src.services.users.upload_file_to_bucket", side_effect=lambda bucket, content, name: f"https://cdn/{name}"):
+            role_data = await UserService.prepare_driver_data(
+                "TAXI-1", None, self._upload("id.png", 10), self._upload("license.png", 10)
+            )
+
+        assert role_data == {
+            "id_card": "https://cdn/id.png",
+            "driver_license": "https://cdn/license.png",
+            "taxi_number": "TAXI-1",
+        }
+
+    async def test_oversized_file_uploads_nothing(self, monkeypatch):
+        """Test a file over the size cap rejects the signup before its sibling is uploaded."""
+        monkeypatch.setattr(settings, "max_upload_size_mb", 1)
+
+        with patch("src.services.users.upload_file_to_bucket") as mock_upload:
+            with pytest.raises(HTTPException) as exc_info:
+                await UserService.prepare_driver_data(
+                    "TAXI-1", None, self._upload("id.png", 10), self._upload("license.png", 2 * 1024 * 1024)
+                )
+
+        assert exc_info.value.status_code == 413
+        mock_upload.assert_not_called()
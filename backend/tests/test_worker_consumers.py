@@ -0,0 +1,108 @@
+"""
+Test the batching consumer scaffold.
+"""
+
+import pytest
+from unittest.mock import MagicMock, call
+from src.workers.consumers import BatchConsumer
+
+
+def test_batch_consumer_fills_batch_and_commits_once():
+    """Test that records are handled as one batch with a single commit."""
+    consumer = MagicMock()
+    consumer.poll.side_effect = list(range(5)) + [None] * 100
+    handler = MagicMock()
+
+    batch_consumer = BatchConsumer(consumer, handler, max_batch=3, max_wait_ms=1000)
+    handled = batch_consumer.run_once()
+
+    assert handled == 3
+    handler.assert_called_once_with([0, 1, 2])
+    consumer.commit.assert_called_once_with(asynchronous=False)
+
+
+def test_batch_consumer_stops_at_deadline():
+    """Test that a partial batch is returned when the wait deadline passes."""
+    consumer = MagicMock()
+    consumer.poll.return_value = None
+    handler = MagicMock()
+
+    batch_consumer = BatchConsumer(consumer, handler, max_batch=10, max_wait_ms=5)
+    handled = batch_consumer.run_once()
+
+    assert handled == 0
+    handler.assert_not_called()
+    consumer.commit.assert_not_called()
+
+
+def test_batch_consumer_skips_commit_with_auto_commit():
+    """Test that offsets are left to the client when auto-commit is enabled."""
+    consumer = MagicMock()
+    consumer.poll.side_effect = ["a", "b"] + [None] * 100
+    handler = MagicMock()
+
+    batch_consumer = BatchConsumer(consumer, handler, max_batch=2, enable_auto_commit=True)
+    batch_consumer.run_once()
+
+    handler.assert_called_once_with(["a", "b"])
+    consumer.commit.assert_not_called()
+
+
+def test_batch_consumer_decoupled_fetch_commits_handled_records():
+    """Test that the fetcher thread prefetches batches and commits per partition."""
+    records = []
+    for offset in range(4):
+        record = MagicMock()
+        record.topic.return_value = "trips"
+        record.partition.return_value = offset % 2
+        records.append(record)
+
+    pending = list(records)
+    consumer = MagicMock()
+    consumer.poll.side_effect = lambda timeout: pending.pop(0) if pending else None
+    handler = MagicMock()
+
+    batch_consumer = BatchConsumer(
+        consumer, handler, max_batch=4, max_wait_ms=200, decouple_fetch=True
+    )
+    batch_consumer.start_fetcher()
+    try:
+        handled = batch_consumer.run_once()
+    finally:
+        batch_consumer.stop_fetcher()
+
+    assert handled == 4
+    handler.assert_called_once_with(records)
+    consumer.commit.assert_has_calls([
+        call(message=records[2], asynchronous=False),
+        call(message=records[3], asynchronous=False),
+    ], any_order=True)
+    assert consumer.commit.call_count == 2
+
+
+def test_batch_consumer_drain_handles_prefetched_batches():
+    """Test that drain handles buffered batches and reports none left in flight."""
+    consumer = MagicMock()
+    handler = MagicMock()
+
+    batch_consumer = BatchConsumer(consumer, handler, enable_auto_commit=True, decouple_fetch=True)
+    batch_consumer._batches.extend([["a"], ["b", "c"]])
+
+    assert batch_consumer.drain(timeout=1.0) == 0
+    handler.assert_has_calls([call(["a"]), call(["b", "c"])])
+
+
+def test_batch_consumer_reraises_fetcher_errors():
+    """Test that a poll failure in the fetcher thread surfaces from run instead of stalling it."""
+    consumer = MagicMock()
+    consumer.poll.side_effect = ["a", ConnectionError("broker down")]
+    handler = MagicMock()
+
+    batch_consumer = BatchConsumer(
+        consumer, handler, max_batch=1, max_wait_ms=200, enable_auto_commit=True, decouple_fetch=True
+    )
+
+    with pytest.raises(ConnectionError, match="broker down"):
+        batch_consumer.run(should_stop=lambda: False)
+
+    handler.assert_called_once_with(["a"])
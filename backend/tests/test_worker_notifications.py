@@ -0,0 +1,32 @@
+"""
+Test the notification fan-out task.
+"""
+
+import httpx
+from unittest.mock import AsyncMock, MagicMock, patch
+from src.workers.tasks.notifications import send_notifications
+
+
+async def test_send_notifications_batches_and_counts_failures():
+    """Test that notifications are posted in batches and failures are counted."""
+    request = httpx.Request("POST", "https://push.example.com/send")
+    responses = [
+        httpx.Response(200, request=request),
+        httpx.Response(500, request=request),
+        httpx.ConnectError("boom"),
+        httpx.Response(200, request=request),
+        httpx.Response(200, request=request),
+    ]
+    client = MagicMock()
+    client.post = AsyncMock(side_effect=responses)
+
+    with patch('src.workers.tasks.notifications.get_http_client', return_value=client):
+        result = await send_notifications(
+            "https://push.example.com/send",
+            [{"id": i} for i in range(5)],
+            max_batch=2,
+        )
+
+    assert result == {"sent": 3, "failed": 2}
+    assert client.post.await_count == 5
+    client.post.assert_any_await("https://push.example.com/send", json={"id": 4})
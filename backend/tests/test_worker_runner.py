@@ -0,0 +1,56 @@
+"""
+Test the stream consumer shutdown sequence.
+"""
+
+import asyncio
+import threading
+import pytest
+from unittest.mock import MagicMock, patch
+from src.workers import runner
+from src.workers.consumers import BatchConsumer
+
+
+@pytest.fixture
+def shutdown():
+    """Patch signal handling and client teardown; yields the recorded calls."""
+    calls = []
+
+    async def close_http_client():
+        calls.append(("http", asyncio.get_running_loop()))
+
+    with patch.object(runner, "install_signal_handlers"), \
+         patch.object(runner, "_draining", threading.Event()), \
+         patch.object(runner, "close_http_client", close_http_client), \
+         patch.object(runner.RedisPools, "disconnect_all", lambda: calls.append(("redis", None))):
+        yield calls
+
+
+def test_run_consumer_closes_http_client_on_handler_loop(shutdown):
+    """Test the HTTP client is closed on the loop the handler ran its coroutines on."""
+    handler_loops = []
+
+    def handler(msgs):
+        handler_loops.append(asyncio.get_event_loop())
+        runner._draining.set()
+
+    consumer = MagicMock()
+    consumer.poll.side_effect = ["a"] + [None] * 100
+    runner.run_consumer(BatchConsumer(consumer, handler, max_batch=1), drain_timeout=1.0)
+
+    consumer.close.assert_called_once()
+    assert [name for name, _ in shutdown] == ["redis", "http"]
+    assert shutdown[1][1] is handler_loops[0]
+    assert handler_loops[0].is_closed()
+
+
+def test_run_consumer_cleans_up_when_handler_fails(shutdown):
+    """Test a failing handler still closes the consumer, Redis pools and HTTP client."""
+    consumer = MagicMock()
+    consumer.poll.side_effect = ["a"] + [None] * 100
+    handler = MagicMock(side_effect=RuntimeError("handler failed"))
+
+    with pytest.raises(RuntimeError, match="handler failed"):
+        runner.run_consumer(BatchConsumer(consumer, handler, max_batch=1), drain_timeout=1.0)
+
+    consumer.close.assert_called_once()
+    assert [name for name, _ in shutdown] == ["redis", "http"]
@@ -0,0 +1,61 @@
+"""
+Test the worker retry helpers and Redis pools.
+"""
+
+import random
+import pytest
+from unittest.mock import AsyncMock, patch
+from src.core import cache
+from src.core.settings import settings
+from src.workers.utils import RedisPools, retry_delay, sleep_backoff
+
+
+def test_retry_delay_within_full_jitter_bounds():
+    """Test that every delay lies in [0, base * 2 ** attempt]."""
+    random.seed(1234)
+    for attempt in range(8):
+        for _ in range(50):
+            delay = retry_delay(attempt, base=0.1, cap=100.0)
+            assert 0 <= delay <= 0.1 * (2 ** attempt)
+
+
+def test_retry_delay_respects_cap():
+    """Test that large attempt numbers never exceed the cap."""
+    random.seed(1234)
+    for _ in range(50):
+        assert 0 <= retry_delay(30, base=0.1, cap=5.0) <= 5.0
+
+
+async def test_sleep_backoff_sleeps_for_retry_delay():
+    """Test that sleep_backoff awaits asyncio.sleep with the computed delay."""
+    with patch('src.workers.utils.retry_delay', return_value=0.25) as mock_delay, \
+         patch('src.workers.utils.asyncio.sleep', new_callable=AsyncMock) as mock_sleep:
+        await sleep_backoff(3, base=0.5, cap=10.0)
+
+    mock_delay.assert_called_once_with(3, base=0.5, cap=10.0)
+    mock_sleep.assert_awaited_once_with(0.25)
+
+
+@pytest.fixture
+def redis_pools(monkeypatch):
+    """Configure a Redis URL and start from fresh, automatically restored pools."""
+    pytest.importorskip("redis")
+    monkeypatch.setattr(settings, "redis_url", "redis://localhost:6379/0")
+    for attr in ("_cache", "_async_cache", "_queue", "_pubsub"):
+        monkeypatch.setattr(RedisPools, attr, None)
+
+
+@pytest.mark.usefixtures("redis_pools")
+def test_core_cache_clients_share_the_cache_pools():
+    """Test the API cache helpers draw from RedisPools instead of their own pools."""
+    assert cache.get_sync_redis().connection_pool is RedisPools.cache()
+    assert cache.get_async_redis().connection_pool is RedisPools.async_cache()
+    assert RedisPools.cache() is not RedisPools.queue()
+
+
+def test_core_cache_disabled_without_redis_url(monkeypatch):
+    """Test the cache helpers return no client when Redis is not configured."""
+    monkeypatch.setattr(settings, "redis_url", None)
+
+    assert cache.get_sync_redis() is None
+    assert cache.get_async_redis() is None